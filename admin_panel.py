@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# 관리자 사이드바: 계측 값 표시 (CHEM_METRICS=1 이고 주소에 ?admin=1 일 때만)
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import metrics
+
+
+def count_rerun():
+    # 세션별 재실행 횟수 — 세션의 첫 실행이면 세션 수도 올린다
+    # 계측을 켜면 프로세스 전체 표(metrics.snapshot()의 sessions)에도 세션 id별로 남긴다
+    reruns = st.session_state.get("_reruns", 0) + 1
+    st.session_state["_reruns"] = reruns
+    if reruns == 1:
+        metrics.incr("sessions")
+    metrics.incr("reruns")
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        metrics.session_rerun(ctx.session_id)
+    return reruns
+
+
+def count_fragment_rerun():
+    # st.fragment 안에서 부른다 — 조각만 다시 실행될 때(입력할 때마다)도 재실행으로 센다
+    # 전체 재실행 중이면 main.py의 count_rerun()이 이미 셌으므로 건너뛴다
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        metrics.incr("reruns.fragment")
+        count_rerun()
+
+
+def admin_sidebar(reruns: int):
+    if not metrics.ENABLED or st.query_params.get("admin") != "1":
+        return
+    snap = metrics.snapshot()
+    with st.sidebar:
+        st.markdown("### 📊 성능 계측")
+        st.caption(f"이 세션 재실행 {reruns}회")
+        if snap["timings"]:
+            names = sorted(snap["timings"])
+            st.table({"단계": names,
+                      "횟수": [snap["timings"][n]["count"] for n in names],
+                      "평균(ms)": [round(snap["timings"][n]["mean_ms"], 3) for n in names],
+                      "최대(ms)": [round(snap["timings"][n]["max_s"] * 1e3, 3) for n in names]})
+        if snap["caches"]:
+            names = sorted(snap["caches"])
+            st.table({"캐시": names,
+                      "적중": [snap["caches"][n]["hits"] for n in names],
+                      "실패": [snap["caches"][n]["misses"] for n in names],
+                      "적중률": [f"{snap['caches'][n]['ratio']:.1%}" for n in names]})
+        if snap["counters"]:
+            st.json(snap["counters"])
+        st.download_button("Prometheus 텍스트", metrics.prometheus_text(), "metrics.txt")
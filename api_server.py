@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# 헤드리스 HTTP/JSON API — python api_server.py --port 8080
+#   GET  /compound/{query}              화학식·이름 검색 (없으면 404 + 추천)
+#   GET  /mass?formula=CuSO4·5H2O       원소 조성과 몰질량
+#   GET  /find?mass=58.4&tol=0.1&include=Na&exclude=C
+#   GET  /isotopes?formula=C6H12O6      단일 동위원소 질량과 동위원소 분포
+#   POST /batch  {"formulas": [...]}    대량 몰질량
+#   GET  /balance?equation=...          반응식 계수 맞추기
+#   POST /balance {"equations": [...]}  반응식 여러 개
+#   GET  /metrics, /metrics.json        계측 값 (CHEM_METRICS=1 일 때 수집)
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from balancer import balance_many
+import metrics
+from chem_core import get_core
+from reverse_index import parse_element_list
+
+MAX_BODY = 32 * 1024 * 1024
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 431: "Request Header Fields Too Large",
+            500: "Internal Server Error"}
+
+
+class RawText(str):
+    # JSON 대신 text/plain 으로 보낼 응답 (Prometheus 수집용)
+    pass
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# =====================================
+# 라우팅
+# =====================================
+def _compound(core, query: str):
+    result = core.lookup(query)
+    if result["formula"] is None:
+        return 404, result
+    try:
+        comp = core.composition(result["formula"])
+    except ValueError:
+        comp = None
+    return 200, dict(result, composition=comp)
+
+
+def _mass(core, params):
+    formula = params.get("formula", [""])[0]
+    if not formula.strip():
+        raise HttpError(400, "formula 파라미터가 필요합니다.")
+    try:
+        comp = core.composition(formula)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    if comp["unknown"]:
+        raise HttpError(400, "알 수 없는 원소: " + ", ".join(comp["unknown"]))
+    return 200, comp
+
+
+async def _isotopes(core, params):
+    formula = params.get("formula", [""])[0]
+    if not formula.strip():
+        raise HttpError(400, "formula 파라미터가 필요합니다.")
+    try:
+        threshold = float(params.get("threshold", ["1e-6"])[0])
+        min_relative = float(params.get("min", ["0.01"])[0])
+    except ValueError:
+        raise HttpError(400, "threshold, min 은 숫자여야 합니다.")
+    if not 0 < threshold < 1:
+        raise HttpError(400, "threshold 는 0과 1 사이여야 합니다.")
+    # 분포 전개는 CPU 작업이라 /batch처럼 스레드에서 계산
+    loop = asyncio.get_running_loop()
+    try:
+        return 200, await loop.run_in_executor(None, core.isotopes, formula, threshold, min_relative)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+
+
+def _find(core, params):
+    try:
+        mass = float(params["mass"][0]) if "mass" in params else None
+        tol = float(params.get("tol", ["0.1"])[0])
+        limit = int(params.get("limit", ["50"])[0])
+    except ValueError:
+        raise HttpError(400, "mass, tol, limit 는 숫자여야 합니다.")
+    try:
+        hits = core.find(mass, tol, parse_element_list(params.get("include", [""])[0]),
+                         parse_element_list(params.get("exclude", [""])[0]), limit)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    return 200, [{"formula": f, "mass": m} for f, m in hits]
+
+
+async def _batch(core, body: bytes):
+    try:
+        payload = json.loads(body or b"null")
+        formulas = payload["formulas"]
+        if not isinstance(formulas, list) or not all(isinstance(f, str) for f in formulas):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        raise HttpError(400, '본문은 {"formulas": ["H2O", ...]} 형식이어야 합니다.')
+    # 큰 배치는 이벤트 루프를 막지 않도록 스레드에서 계산
+    loop = asyncio.get_running_loop()
+    return 200, await loop.run_in_executor(None, core.batch_mass, formulas)
+
+
+def _balanced(result):
+    eq, error = result
+    if eq is None:
+        return {"error": error}
+    return {"equation": str(eq), "coefficients": eq.coefficients}
+
+
+async def _balance(method: str, params, body: bytes):
+    if method == "GET":
+        equation = params.get("equation", [""])[0]
+        if not equation.strip():
+            raise HttpError(400, "equation 파라미터가 필요합니다.")
+        out = _balanced(balance_many([equation])[0])
+        return (400 if "error" in out else 200), out
+    try:
+        equations = json.loads(body or b"null")["equations"]
+        if not isinstance(equations, list) or not all(isinstance(e, str) for e in equations):
+            raise TypeError
+    except (ValueError, KeyError, TypeError):
+        raise HttpError(400, '본문은 {"equations": ["CH4 + O2 -> CO2 + H2O", ...]} 형식이어야 합니다.')
+    # 대량 제출은 이벤트 루프를 막지 않도록 /batch처럼 스레드에서 계산
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(None, balance_many, equations)
+    return 200, [_balanced(r) for r in results]
+
+
+async def dispatch(core, method: str, target: str, body: bytes):
+    url = urlsplit(target)
+    path = url.path
+    params = parse_qs(url.query)
+    if path.startswith("/compound/"):
+        if method != "GET":
+            raise HttpError(405, "GET만 지원합니다.")
+        return _compound(core, unquote(path[len("/compound/"):]))
+    if path == "/mass":
+        if method != "GET":
+            raise HttpError(405, "GET만 지원합니다.")
+        return _mass(core, params)
+    if path == "/isotopes":
+        if method != "GET":
+            raise HttpError(405, "GET만 지원합니다.")
+        return await _isotopes(core, params)
+    if path == "/find":
+        if method != "GET":
+            raise HttpError(405, "GET만 지원합니다.")
+        return _find(core, params)
+    if path == "/batch":
+        if method != "POST":
+            raise HttpError(405, "POST만 지원합니다.")
+        return await _batch(core, body)
+    if path == "/balance":
+        if method not in ("GET", "POST"):
+            raise HttpError(405, "GET, POST만 지원합니다.")
+        return await _balance(method, params, body)
+    if path == "/metrics":
+        return 200, RawText(metrics.prometheus_text())
+    if path == "/metrics.json":
+        return 200, metrics.snapshot()
+    if path == "/health":
+        return 200, {"status": "ok", "version": core.version}
+    raise HttpError(404, "없는 경로입니다.")
+
+
+# =====================================
+# HTTP/1.1 (keep-alive) 연결 처리
+# =====================================
+def _response(status: int, payload, keep_alive: bool) -> bytes:
+    if isinstance(payload, RawText):
+        body, ctype = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        body, ctype = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {ctype}; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def handle_connection(reader, writer, core=None):
+    # core를 주지 않으면 요청마다 get_core() — 새 스냅숏이 게시되면 연결을 끊지 않고 갈아탄다
+    try:
+        while True:
+            try:
+                request_line = await reader.readline()
+            except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                break
+            if not request_line.strip():
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_response(400, {"error": "잘못된 요청 줄"}, False))
+                break
+            headers = {}
+            try:
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            except (asyncio.LimitOverrunError, ValueError):  # 스트림 한도(64 KiB)를 넘는 머리글 줄
+                writer.write(_response(431, {"error": "머리글이 너무 깁니다."}, False))
+                break
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError
+            except ValueError:
+                writer.write(_response(400, {"error": "잘못된 Content-Length"}, False))
+                break
+            if length > MAX_BODY:
+                writer.write(_response(413, {"error": "본문이 너무 큽니다."}, False))
+                break
+            body = await reader.readexactly(length) if length else b""
+            metrics.incr("api.requests")
+            try:
+                with metrics.span("api"):
+                    status, payload = await dispatch(core or get_core(), method, target, body)
+            except HttpError as e:
+                status, payload = e.status, {"error": str(e)}
+            except Exception as e:  # 연결은 살려 두고 500으로 응답
+                status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080):
+    get_core()  # 첫 요청 전에 저장소(또는 스냅숏)를 연다
+    server = await asyncio.start_server(handle_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="화합물 정보 사전 HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
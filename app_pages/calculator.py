@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# 계산 도구 페이지: 역검색, 반응식 계수 맞추기, 용액 계산
+import streamlit as st
+
+from balancer import balance
+from reverse_index import parse_element_list
+from solution import (dilution, format_quantity, mass_from_moles, moles_from_mass, parse_quantity,
+                      percent_composition, prep_sheet, solute_mass)
+from ui_common import core, sub_title
+
+engine = core()
+
+# =====================================
+# 역검색 (몰질량 · 원소 조건)
+# =====================================
+sub_title("⚖️ 몰질량·원소 조건으로 찾기")
+c1, c2 = st.columns(2)
+target = c1.number_input("몰질량 (g/mol, 0이면 무시)", min_value=0.0, value=0.0, step=0.1)
+tol = c2.number_input("허용 오차 (±)", min_value=0.0, value=0.1, step=0.05)
+c3, c4 = st.columns(2)
+include = c3.text_input("포함할 원소 (예: N, O)")
+exclude = c4.text_input("제외할 원소 (예: C)")
+if target or include.strip() or exclude.strip():
+    try:
+        hits = engine.find(target or None, tol,
+                           parse_element_list(include), parse_element_list(exclude))
+    except ValueError as e:
+        st.error(str(e))
+    else:
+        if hits:
+            st.table({"화학식": [f for f, _ in hits],
+                      "이름": [engine.store.get(f)["이름"] for f, _ in hits],
+                      "몰질량(g/mol)": [round(m, 3) for _, m in hits]})
+        else:
+            st.warning("조건에 맞는 화합물이 없습니다.")
+
+# =====================================
+# 반응식 계수 맞추기
+# =====================================
+sub_title("⚗️ 반응식 계수 맞추기")
+equation = st.text_input("반응식 (예: CH4 + O2 -> CO2 + H2O)")
+if equation.strip():
+    try:
+        st.success(str(balance(equation)))
+    except ValueError as e:
+        st.error(f"반응식 오류: {e}")
+
+# =====================================
+# 용액 계산 (몰질량은 엔진 캐시에서)
+# =====================================
+sub_title("🧪 용액 계산")
+compound = st.text_input("화합물 (화학식 또는 이름, 예: NaCl, 포도당)")
+formula = molar = None
+if compound.strip():
+    formula = engine.lookup(compound)["formula"] or compound.strip()
+    try:
+        comp = engine.composition(formula)
+        if comp["unknown"]:
+            raise ValueError("알 수 없는 원소: " + ", ".join(comp["unknown"]))
+        molar = comp["mass"]
+        st.caption(f"{formula} — 몰질량 {molar:.3f} g/mol")
+    except ValueError as e:
+        st.error(f"화학식 오류: {e}")
+
+tab_mass, tab_make, tab_dilute, tab_pct, tab_sheet = st.tabs(
+    ["질량 ↔ 몰", "용액 만들기", "희석", "조성 백분율", "준비표"])
+
+with tab_mass:
+    direction = st.radio("변환", ["질량 → 몰", "몰 → 질량"], horizontal=True)
+    amount = st.text_input("값 (예: 5 g, 20 mmol)")
+    if amount.strip() and molar:
+        try:
+            if direction == "질량 → 몰":
+                st.success(format_quantity(moles_from_mass(parse_quantity(amount, "mass"), molar), "amount"))
+            else:
+                st.success(format_quantity(mass_from_moles(parse_quantity(amount, "amount"), molar), "mass"))
+        except ValueError as e:
+            st.error(str(e))
+
+with tab_make:
+    c1, c2 = st.columns(2)
+    conc = c1.text_input("몰농도", "0.1 M")
+    vol = c2.text_input("부피", "250 mL")
+    if molar:
+        try:
+            grams = solute_mass(parse_quantity(conc, "molarity"), parse_quantity(vol, "volume"), molar)
+            st.success(f"{formula} {format_quantity(grams, 'mass')}을(를) 녹여 {vol.strip()}로 맞춥니다.")
+        except ValueError as e:
+            st.error(str(e))
+
+with tab_dilute:
+    st.caption("C1V1 = C2V2 — 넷 중 하나를 비워 두면 계산합니다.")
+    c1, c2, c3, c4 = st.columns(4)
+    fields = {"c1": (c1.text_input("원액 농도 C1", "1 M"), "molarity"),
+              "v1": (c2.text_input("원액 부피 V1"), "volume"),
+              "c2": (c3.text_input("목표 농도 C2", "0.1 M"), "molarity"),
+              "v2": (c4.text_input("목표 부피 V2", "500 mL"), "volume")}
+    try:
+        args = {k: parse_quantity(v, kind) if v.strip() else None for k, (v, kind) in fields.items()}
+        missing = [k for k, v in args.items() if v is None]
+        value = dilution(**args)
+        st.success(f"{missing[0].upper()} = {format_quantity(value, fields[missing[0]][1])}")
+    except ValueError as e:
+        st.error(str(e))
+
+with tab_pct:
+    if molar:
+        rows = percent_composition(formula)
+        st.table({"원소": [el for el, _, _ in rows], "개수": [n for _, n, _ in rows],
+                  "질량 백분율(%)": [round(p, 3) for _, _, p in rows]})
+
+with tab_sheet:
+    st.caption("표에 여러 용액을 입력하면 한 번에 계산합니다 (스프레드시트에서 붙여 넣기 가능).")
+    sheet = st.data_editor({"화학식": ["NaCl", "C6H12O6", "HCl"], "몰농도": ["0.1 M", "50 mM", "0.5 M"],
+                            "부피": ["250 mL", "1 L", "100 mL"], "원액 농도": ["", "", "12 M"]},
+                           num_rows="dynamic", width="stretch")
+    result = prep_sheet([(f or "").strip() for f in sheet["화학식"]], sheet["몰농도"], sheet["부피"],
+                        sheet["원액 농도"])
+    st.dataframe(result.table(), width="stretch")
+    st.download_button("CSV로 받기", result.to_csv(), "prep_sheet.csv")
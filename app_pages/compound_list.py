@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+# 목록 페이지: 지원 화합물 카드 (페이지 단위, HTML 조각 캐시)
+import streamlit as st
+
+import metrics
+from ui_common import html_cache, sub_title
+
+cache = html_cache()
+sub_title("📖 검색 가능한 화합물 목록")
+page = 1
+if cache.pages > 1:
+    page = st.number_input(f"페이지 (전체 {cache.pages})", min_value=1,
+                           max_value=cache.pages, value=1, step=1)
+with metrics.span("render.list"):
+    cols = st.columns(2)
+    for col, fragment in zip(cols, cache.list_page(int(page))):
+        col.markdown(fragment, unsafe_allow_html=True)
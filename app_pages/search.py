@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# 검색 페이지: 화학식·한글 이름 → 기본 정보 카드 + 원소 조성
+import streamlit as st
+
+import metrics
+from admin_panel import count_fragment_rerun
+from formula_engine import get_composition
+from render import composition_table
+from search_session import SearchSession
+from solution import format_quantity, parse_quantity, solute_mass
+from ui_common import core, html_cache, sub_title
+
+st.write("H2O, CO2 같은 화학식이나 '물', '이산화탄소' 같은 한글 이름을 입력하면 정보를 알려줍니다.")
+
+
+def _session() -> SearchSession:
+    # 세션별 검색 상태 — 데이터 버전이 바뀌면 새로 만든다
+    engine = core()
+    session = st.session_state.get("_search_session")
+    if session is None or session.version != engine.version:
+        cards = html_cache()
+
+        def warm(formula: str):
+            # 결과 화면에 필요한 것을 미리 캐시에 올린다 (미리 가져오기 스레드에서도 불리므로 st.* 금지)
+            cards.card(formula)
+            composition_table(get_composition(formula))
+
+        session = st.session_state["_search_session"] = SearchSession(engine, warm)
+    return session
+
+
+# 입력이 바뀌면 이 조각만 다시 실행 (제목·CSS·내비게이션은 그대로)
+@st.fragment
+def search_box():
+    count_fragment_rerun()
+    # live: 입력이 멈추고 250ms 뒤에 반영 (Enter를 누르지 않아도 됨)
+    # '300ms' 같은 문자열은 Streamlit이 pandas로 해석해 NumPy까지 불러오므로 기본값(True)을 쓴다
+    user_input = st.text_input("🔎 화학식 또는 한글 이름을 입력하세요:", live=True)
+    if user_input.strip():
+        with metrics.span("lookup"):
+            result = _session().search(user_input)
+        matches, suggestions = result["matches"], result["suggestions"]
+        if not matches:
+            st.error("해당 화합물은 데이터베이스에 없습니다.")
+            if suggestions:
+                st.info("혹시 이 화합물을 찾으셨나요? " + ", ".join(f"{name} ({f})" for name, f, _ in suggestions))
+        else:
+            formula = matches[0]
+            if len(matches) > 1:
+                st.caption("같은 조성의 다른 화합물: " + ", ".join(matches[1:]))
+
+            # ----- 기본 정보 (아이콘 포함 카드) -----
+            sub_title("기본 정보")
+            with metrics.span("render.card"):
+                st.markdown(html_cache().card(formula), unsafe_allow_html=True)
+
+            # ----- 원소 조성 및 몰질량 -----
+            try:
+                comp = get_composition(formula)
+                sub_title("원소 조성 및 몰질량")
+                with metrics.span("render.composition"):
+                    table = composition_table(comp)
+                st.table(table)
+                st.success(f"총 몰질량: {comp.mass:.3f} g/mol")
+                # 접힌 expander도 본문은 실행되므로 분포 계산(NumPy)은 토글을 켰을 때만
+                with st.expander("🔬 동위원소 분포 (질량 분석)"):
+                    if st.toggle("분포 계산하기"):
+                        iso = core().isotopes(formula)
+                        st.write(f"단일 동위원소 질량: **{iso['monoisotopic']:.5f}**  ·  "
+                                 f"가장 큰 봉우리: {iso['most_abundant']:.5f}")
+                        peaks = [p for p in iso["peaks"] if p["relative"] >= 0.1]
+                        st.bar_chart({"m/z": [f"{p['mz']:.4f}" for p in peaks],
+                                      "상대 세기(%)": [p["relative"] for p in peaks]}, x="m/z")
+                with st.expander("🧪 이 화합물로 용액 만들기"):
+                    c1, c2 = st.columns(2)
+                    conc = c1.text_input("몰농도", "0.1 M")
+                    vol = c2.text_input("부피", "100 mL")
+                    try:
+                        grams = solute_mass(parse_quantity(conc, "molarity"),
+                                            parse_quantity(vol, "volume"), comp.mass)
+                        st.write(f"필요한 {formula}: **{format_quantity(grams, 'mass')}**")
+                    except ValueError as e:
+                        st.warning(str(e))
+            except Exception as e:
+                st.error(f"원소 분석 오류: {e}")
+
+
+search_box()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# 화학 반응식 계수 맞추기: 원소 × 화학종 행렬의 정수 영공간 (분수 없는 소거)
+import re
+from functools import lru_cache
+from math import gcd
+
+from formula_engine import get_composition
+
+_ARROW = re.compile(r"\s*(?:<=>|<->|⇌|→|->|=>|=)\s*")
+_PLUS = re.compile(r"\s+\+\s+")
+# 공백 없는 'CH4+O2' — 뒤에 화학종(계수·대문자·괄호)이 시작하는 +만 구분자로 본다
+_BARE_PLUS = re.compile(r"\s*\+\s*(?=\d*\s*[A-Z(\[{])")
+_COEF = re.compile(r"^\d+\s*")
+
+
+class BalancedEquation:
+    # reactants/products: [(계수, 화학식)]
+    __slots__ = ('reactants', 'products')
+
+    def __init__(self, reactants, products):
+        self.reactants = reactants
+        self.products = products
+
+    @staticmethod
+    def _side(items):
+        return " + ".join(f"{c if c != 1 else ''}{f}" for c, f in items)
+
+    def __str__(self):
+        return f"{self._side(self.reactants)} -> {self._side(self.products)}"
+
+    def __repr__(self):
+        return f"BalancedEquation({str(self)!r})"
+
+    @property
+    def coefficients(self) -> list:
+        return [c for c, _ in self.reactants] + [c for c, _ in self.products]
+
+
+# =====================================
+# 반응식 파싱
+# =====================================
+def _parses(species) -> bool:
+    try:
+        for s in species:
+            get_composition(s)
+    except ValueError:
+        return False
+    return True
+
+
+def _split_side(side: str) -> list:
+    species = [_COEF.sub('', s.strip()) for s in _PLUS.split(side)]
+    if not _parses(species):
+        bare = [_COEF.sub('', s.strip()) for s in _BARE_PLUS.split(side)]
+        if len(bare) > len(species) and _parses(bare):
+            return bare
+    return species
+
+
+def split_equation(equation: str):
+    # 'CH4 + O2 -> CO2 + H2O' → (['CH4', 'O2'], ['CO2', 'H2O'])
+    # 화학종 사이의 +는 앞뒤에 공백을 두는 것이 기본 (NH4+ 같은 전하와 구분)
+    # 그렇게 나눠 해석되지 않으면 'CH4+O2'처럼 붙여 쓴 +로 다시 나눠 본다
+    sides = _ARROW.split(equation.strip())
+    if len(sides) != 2 or not sides[0] or not sides[1]:
+        raise ValueError("반응식은 '반응물 -> 생성물' 형태여야 합니다.")
+    left, right = (_split_side(side) for side in sides)
+    if not all(left) or not all(right):
+        raise ValueError("빈 화학종이 있습니다.")
+    return left, right
+
+
+def _normalized(equation: str) -> tuple:
+    left, right = split_equation(equation)
+    return tuple(left), tuple(right)
+
+
+# =====================================
+# 정수 영공간
+# =====================================
+def _row_reduce(matrix, ncols):
+    # 분수 없는 가우스-요르단 소거: 행마다 gcd로 나눠 값이 커지지 않게 한다
+    rows = [r[:] for r in matrix if any(r)]
+    pivots = []
+    r = 0
+    for c in range(ncols):
+        pivot = next((i for i in range(r, len(rows)) if rows[i][c]), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        pr = rows[r]
+        p = pr[c]
+        for i in range(len(rows)):
+            if i != r and rows[i][c]:
+                f = rows[i][c]
+                row = [p * a - f * b for a, b in zip(rows[i], pr)]
+                g = 0
+                for v in row:
+                    g = gcd(g, v)
+                rows[i] = [v // g for v in row] if g > 1 else row
+        pivots.append(c)
+        r += 1
+        if r == len(rows):
+            break
+    return rows[:r], pivots
+
+
+def _nullspace_vector(matrix, ncols):
+    rows, pivots = _row_reduce(matrix, ncols)
+    free = [c for c in range(ncols) if c not in pivots]
+    if not free:
+        raise ValueError("계수를 맞출 수 없는 반응식입니다.")
+    if len(free) > 1:
+        raise ValueError(f"독립적인 반응이 {len(free)}개 섞여 있어 계수가 하나로 정해지지 않습니다.")
+    fc = free[0]
+    # 자유 변수 = 피벗들의 최소공배수 → 모든 해가 정수
+    lcm = 1
+    for row, c in zip(rows, pivots):
+        p = abs(row[c])
+        lcm = lcm * p // gcd(lcm, p)
+    x = [0] * ncols
+    x[fc] = lcm
+    for row, c in zip(rows, pivots):
+        x[c] = -row[fc] * lcm // row[c]
+    g = 0
+    for v in x:
+        g = gcd(g, v)
+    x = [v // g for v in x]
+    if all(v <= 0 for v in x):
+        x = [-v for v in x]
+    if any(v <= 0 for v in x):
+        raise ValueError("모든 계수가 양수가 되도록 맞출 수 없습니다.")
+    return x
+
+
+@lru_cache(maxsize=4096)
+def _balance(left: tuple, right: tuple) -> BalancedEquation:
+    species = left + right
+    comps = [get_composition(s) for s in species]
+    unknown = [el for comp in comps for el in comp.unknown]
+    if unknown:
+        raise ValueError("알 수 없는 원소: " + ", ".join(dict.fromkeys(unknown)))
+    elements = []
+    seen = set()
+    for comp in comps:
+        for el, _ in comp.counts:
+            if el not in seen:
+                seen.add(el)
+                elements.append(el)
+    n_left = len(left)
+    matrix = []
+    for el in elements:
+        matrix.append([dict(comp.counts).get(el, 0) * (1 if j < n_left else -1)
+                       for j, comp in enumerate(comps)])
+    if any(comp.charge for comp in comps):
+        matrix.append([comp.charge * (1 if j < n_left else -1) for j, comp in enumerate(comps)])
+    x = _nullspace_vector(matrix, len(species))
+    return BalancedEquation(list(zip(x[:n_left], left)), list(zip(x[n_left:], right)))
+
+
+def balance(equation: str) -> BalancedEquation:
+    # 입력 계수는 무시하고 새로 맞춘다. 결과는 정규화된 반응식별로 캐시
+    return _balance(*_normalized(equation))
+
+
+def balance_many(equations) -> list:
+    # [(BalancedEquation 또는 None, 오류 메시지 또는 None)]
+    results = []
+    for eq in equations:
+        try:
+            results.append((balance(eq), None))
+        except ValueError as e:
+            results.append((None, str(e)))
+    return results
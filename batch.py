@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# 대량 화학식 처리: 개수 행렬(화학식 × 원소)과 몰질량 벡터를 한 번의 행렬-벡터 곱으로 계산
+import csv
+import re
+
+import numpy as np
+
+from elements import MASSES, N_ELEMENTS, SYMBOL_INDEX, isotope_info
+from formula_engine import _scan, normalize_formula
+
+MASS_VECTOR = np.frombuffer(MASSES, dtype=np.float64)
+
+
+# =====================================
+# 결과 객체
+# =====================================
+class BatchResult:
+    # counts: (화학식 수, 119) int32 행렬 — 열 인덱스 = 원자 번호 (0번 열은 항상 0)
+    # masses: 몰질량 벡터 — 오류 행은 NaN
+    # errors: [(행 번호, 입력 화학식, 오류 메시지)]
+    __slots__ = ('formulas', 'counts', 'masses', 'errors')
+
+    def __init__(self, formulas, counts, masses, errors):
+        self.formulas = formulas
+        self.counts = counts
+        self.masses = masses
+        self.errors = errors
+
+    @property
+    def ok(self):
+        # 오류 없이 처리된 행의 불리언 마스크
+        mask = np.ones(len(self.formulas), dtype=bool)
+        for row, _, _ in self.errors:
+            mask[row] = False
+        return mask
+
+    def __len__(self):
+        return len(self.formulas)
+
+
+# =====================================
+# 배치 API
+# =====================================
+# 괄호·구분자·전하 없이 원소 기호와 숫자만 있는 화학식 (대량 목록은 대부분 이렇다) — 정규식으로 한 번에 나눈다
+_SIMPLE = re.compile(r"(?:[A-Z][a-z]?\d*)+")
+_ELEMENT = re.compile(r"([A-Z][a-z]?)(\d*)")
+# 개수 행렬이 int32이므로 원소 하나의 개수는 이 값까지 (넘으면 그 행만 오류)
+MAX_COUNT = np.iinfo(np.int32).max
+
+
+def _check_counts(zcounts):
+    if zcounts and max(zcounts.values()) > MAX_COUNT:
+        return f"원소 개수가 너무 큽니다 (원소당 최대 {MAX_COUNT:,})"
+    return None
+
+
+def _compose(formula):
+    # {원자 번호: 개수}, 동위원소 라벨이 있으면 정확한 질량 (없으면 None) — 오류면 메시지 문자열
+    formula = normalize_formula(formula)
+    if _SIMPLE.fullmatch(formula) and 'D' not in formula and 'T' not in formula:
+        zcounts = {}
+        get = SYMBOL_INDEX.get
+        for el, n in _ELEMENT.findall(formula):
+            z = get(el)
+            c = int(n) if n else 1
+            if z is None or not c:  # 모르는 기호, 개수 0 — 아래 일반 경로에서 오류 메시지를 만든다
+                break
+            zcounts[z] = zcounts.get(z, 0) + c
+        else:
+            return _check_counts(zcounts) or (zcounts, None)
+    try:
+        counts, _ = _scan(formula)
+    except ValueError as e:
+        return str(e)
+    zcounts = {}
+    exact = None
+    unknown = []
+    for el, n in counts:
+        z = SYMBOL_INDEX.get(el)
+        if z is None:
+            iso = isotope_info(el)
+            if iso is None:
+                unknown.append(el)
+                continue
+            # 동위원소 라벨이 있으면 평균 원자량 내적과 질량이 달라 따로 보정
+            z = iso[0]
+            exact = 0.0
+        zcounts[z] = zcounts.get(z, 0) + n
+    if unknown:
+        return "알 수 없는 원소: " + ", ".join(unknown)
+    error = _check_counts(zcounts)
+    if error:
+        return error
+    if exact is not None:
+        for el, n in counts:
+            z = SYMBOL_INDEX.get(el)
+            exact += (MASSES[z] if z is not None else isotope_info(el)[1]) * n
+    return zcounts, exact
+
+
+def batch_compose(formulas) -> BatchResult:
+    formulas = list(formulas)
+    # 같은 화학식은 한 번만 파싱해 고유 화학식 행렬을 만들고, 행마다 그 행을 가리키는 번호로 펼친다
+    # 공용 LRU(get_composition)를 거치지 않는다 — 한 번 쓰고 버릴 조성이 화면·API의 자주 쓰는 항목을 밀어내지 않도록
+    seen = {}
+    order = []
+    for f in formulas:
+        u = seen.get(f)
+        if u is None:
+            u = seen[f] = len(seen)
+        order.append(u)
+    entries = [_compose(f) for f in seen]
+
+    ucounts = np.zeros((len(entries), N_ELEMENTS + 1), dtype=np.int32)
+    rows, cols, vals = [], [], []
+    bad = np.zeros(len(entries), dtype=bool)
+    for u, entry in enumerate(entries):
+        if isinstance(entry, str):
+            bad[u] = True
+            continue
+        zcounts = entry[0]
+        rows.extend([u] * len(zcounts))
+        cols.extend(zcounts)
+        vals.extend(zcounts.values())
+    if rows:
+        ucounts[rows, cols] = vals
+    umasses = ucounts @ MASS_VECTOR
+    for u, entry in enumerate(entries):
+        if isinstance(entry, str):
+            umasses[u] = np.nan
+        elif entry[1] is not None:
+            umasses[u] = entry[1]
+
+    order = np.array(order, dtype=np.intp)
+    errors = [(int(r), formulas[r], entries[order[r]]) for r in np.flatnonzero(bad[order])]
+    return BatchResult(formulas, ucounts[order], umasses[order], errors)
+
+
+def read_formula_column(path: str, column: str, encoding: str = 'utf-8'):
+    # CSV 파일의 한 열을 한 줄씩 읽어 화학식을 내보낸다
+    with open(path, newline='', encoding=encoding) as fp:
+        reader = csv.DictReader(fp)
+        if column not in (reader.fieldnames or ()):
+            raise ValueError(f"CSV에 '{column}' 열이 없습니다.")
+        for row in reader:
+            yield (row[column] or '').strip()
+
+
+def batch_compose_csv(path: str, column: str, encoding: str = 'utf-8') -> BatchResult:
+    return batch_compose(read_formula_column(path, column, encoding))
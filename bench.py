@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+# 성능 측정·회귀 검사
+#   python bench.py                         전체 실행 후 표로 출력
+#   python bench.py --quick --json out.json 작은 데이터로 실행, 결과를 JSON으로 저장
+#   python bench.py --compare base.json     기준 결과보다 threshold배 이상 느려지면 종료 코드 1
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from collections import defaultdict
+
+from formula_engine import Composition, _scan, get_composition
+
+# 기존 COMPOUNDS 화학식
+COMPOUND_FORMULAS = ["H2O", "CO2", "NaCl", "NH3", "CH4", "C2H5OH", "H2SO4", "HCl",
+                     "CaCO3", "NaHCO3", "C6H12O6", "H2O2"]
+
+
+# =====================================
+# 기존 정규식 + 스택 파서 (비교 기준)
+# =====================================
+TOKEN = re.compile(r"([A-Z][a-z]?|\(|\)|\d+)")
+
+def legacy_parse_formula(formula: str):
+    tokens = TOKEN.findall(formula.replace(' ', ''))
+    stack = [defaultdict(int)]
+    i = 0
+    def add(sym, n): stack[-1][sym] += n
+    while i < len(tokens):
+        t = tokens[i]
+        if t == '(':
+            stack.append(defaultdict(int)); i += 1
+        elif t == ')':
+            i += 1; mult = 1
+            if i < len(tokens) and tokens[i].isdigit():
+                mult = int(tokens[i]); i += 1
+            group = stack.pop()
+            for k, v in group.items(): add(k, v * mult)
+        elif t.isdigit():
+            raise ValueError("숫자가 앞에 오는 표기는 지원하지 않습니다.")
+        else:
+            sym = t; i += 1; mult = 1
+            if i < len(tokens) and tokens[i].isdigit():
+                mult = int(tokens[i]); i += 1
+            add(sym, mult)
+    if len(stack) != 1: raise ValueError("괄호 처리 오류")
+    return dict(stack[0])
+
+
+def _best(fn, number, repeat=5):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+# =====================================
+# 파서 마이크로 벤치마크 (캐시 없이 순수 파싱 비용)
+# =====================================
+def bench_parser(number: int = 2000) -> dict:
+    for f in COMPOUND_FORMULAS:
+        assert dict(_scan(f)[0]) == legacy_parse_formula(f), f
+    legacy = _best(lambda: [legacy_parse_formula(f) for f in COMPOUND_FORMULAS], number)
+    scanner = _best(lambda: [_scan(f) for f in COMPOUND_FORMULAS], number)
+    per = len(COMPOUND_FORMULAS)
+    return {"legacy_us": legacy / per * 1e6, "scanner_us": scanner / per * 1e6,
+            "speedup": legacy / scanner}
+
+
+PARSE_CASES = {
+    "simple": "H2O",
+    "nested": "K4[Fe(CN)6]",
+    "hydrate": "CuSO4·5H2O",
+    "complex_ion": "{[Co(NH3)6]}2(SO4)3",
+    "deep_nesting": "(" * 50 + "H" + ")2" * 50,
+    "long_chain": "CH3" + "CH2" * 500 + "CH3",
+}
+
+
+def bench_parse_kinds(number: int = 500) -> dict:
+    out = {}
+    for name, formula in PARSE_CASES.items():
+        out[f"scan_{name}_us"] = _best(lambda: _scan(formula), number) * 1e6
+    return out
+
+
+# =====================================
+# 몰질량
+# =====================================
+def bench_mass(n_batch: int = 100_000) -> dict:
+    counts, charge = _scan("C6H12O6")
+    get_composition("C6H12O6")
+    out = {
+        "composition_cold_us": _best(lambda: Composition("C6H12O6", counts, charge), 2000) * 1e6,
+        "composition_cached_us": _best(lambda: get_composition("C6H12O6"), 20000) * 1e6,
+    }
+    try:
+        from batch import batch_compose
+    except ImportError:
+        return out
+    rng = random.Random(0)
+    pool = [f"C{rng.randint(1, 30)}H{rng.randint(1, 60)}O{rng.randint(0, 9)}" for _ in range(500)]
+    formulas = [rng.choice(pool) for _ in range(n_batch)]
+    batch_compose(formulas)
+    elapsed = min(timeit.repeat(lambda: batch_compose(formulas), number=1, repeat=3))
+    out["batch_formulas_per_s"] = n_batch / elapsed
+    # 모두 다른 화학식 (중복 제거가 도움이 안 되는 경우)
+    distinct = [f"C{i % 97 + 1}H{i // 97 + 1}O{i % 5 + 1}" for i in range(n_batch)]
+    elapsed = min(timeit.repeat(lambda: batch_compose(distinct), number=1, repeat=3))
+    out["batch_distinct_formulas_per_s"] = n_batch / elapsed
+    return out
+
+
+# =====================================
+# 동위원소 분포 (캐시 없이 전개 비용)
+# =====================================
+ISOTOPE_CASES = {"glucose": "C6H12O6", "brominated": "C12H4Br6O", "protein": "C2934H4615N781O897S39"}
+
+
+def bench_isotopes(number: int = 20) -> dict:
+    try:
+        from isotope_pattern import _pattern
+    except ImportError:
+        return {}
+    out = {}
+    for name, formula in ISOTOPE_CASES.items():
+        comp = get_composition(formula)
+        out[f"pattern_{name}_ms"] = _best(lambda: _pattern.__wrapped__(comp, 1e-6), number) * 1e3
+    return out
+
+
+# =====================================
+# 이름 검색 (작은 실데이터 / 합성 대용량 저장소)
+# =====================================
+def synthetic_records(n: int, seed: int = 0):
+    # 한글 음절을 섞은 가짜 이름 + 서로 다른 화학식
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + rng.randrange(11172)) for _ in range(400)]
+    prefixes = ["염화", "황산", "질산", "탄산", "수산화", "아세트산", "메틸", "에틸", "프로필", "부틸"]
+    for i in range(n):
+        name = rng.choice(prefixes) + ''.join(rng.choices(syllables, k=rng.randint(2, 6)))
+        yield {"화학식": f"C{i % 97 + 1}H{i // 97 + 1}O{i % 5 + 1}", "이름": name,
+               "상태(상온)": rng.choice(["고체", "액체", "기체"]), "종류": "합성",
+               "동의어": [name + "류"]}
+
+
+def _lookup_metrics(prefix: str, store, queries) -> dict:
+    from name_index import NameIndex
+    t = time.perf_counter()
+    index = NameIndex.from_store(store)
+    build = time.perf_counter() - t
+    formula, name, fuzzy, part = queries
+    return {
+        f"{prefix}_index_build_ms": build * 1e3,
+        f"{prefix}_resolve_formula_us": _best(lambda: store.resolve(formula), 500) * 1e6,
+        f"{prefix}_resolve_name_us": _best(lambda: store.resolve(name), 500) * 1e6,
+        f"{prefix}_search_prefix_us": _best(lambda: index.search(part), 200) * 1e6,
+        f"{prefix}_search_fuzzy_us": _best(lambda: index.search(fuzzy), 200) * 1e6,
+    }
+
+
+def bench_lookup(n_large: int = 100_000) -> dict:
+    from compound_store import CompoundStore, build_store, open_default_store
+    out = _lookup_metrics("small", open_default_store(), ("NaCl", "베이킹소다", "에타놀", "탄산"))
+    records = list(synthetic_records(n_large))
+    sample = records[n_large // 2]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        t = time.perf_counter()
+        build_store(path, records)
+        out["large_store_build_ms"] = (time.perf_counter() - t) * 1e3
+        store = CompoundStore(path)
+        try:
+            out.update(_lookup_metrics("large", store, (
+                sample["화학식"], sample["이름"], sample["이름"][:-1] + "가", sample["이름"][:3])))
+        finally:
+            store.close()
+    return out
+
+
+# =====================================
+# 스냅숏 (메모리 매핑 색인) — 여는 비용과 매핑된 색인의 검색 비용
+# =====================================
+def bench_snapshot(n: int = 100_000) -> dict:
+    from compound_store import CompoundStore, build_store
+    from name_index import NameIndex
+    from reverse_index import ReverseIndex
+    from snapshot import Snapshot, publish
+    records = list(synthetic_records(n))
+    sample = records[n // 2]
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db")
+        build_store(db, records)
+        store = CompoundStore(db)
+        t = time.perf_counter()
+        NameIndex.from_store(store)
+        ReverseIndex.from_store(store)
+        out["index_rebuild_ms"] = (time.perf_counter() - t) * 1e3
+        store.close()
+        t = time.perf_counter()
+        name = publish(db, os.path.join(tmp, "snapshots"))
+        out["publish_ms"] = (time.perf_counter() - t) * 1e3
+        t = time.perf_counter()
+        snap = Snapshot(os.path.join(tmp, "snapshots"), name)
+        out["open_ms"] = (time.perf_counter() - t) * 1e3
+        fuzzy = sample["이름"][:-1] + "가"
+        out["search_fuzzy_us"] = _best(lambda: snap.name_index.search(fuzzy), 200) * 1e6
+        out["find_us"] = _best(lambda: snap.reverse_index.query(200.0, 1.0, ("C",)), 200) * 1e6
+        snap.store.close()
+    return out
+
+
+# =====================================
+# 대량 가져오기 / 내보내기
+# =====================================
+def bench_import(n: int = 200_000) -> dict:
+    from compound_store import CompoundStore
+    from importer import export_file, import_file
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src.jsonl")
+        with open(src, "w", encoding="utf-8") as fp:
+            for rec in synthetic_records(n):
+                fp.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        for label, workers in (("inline", 0), ("pool", None)):
+            db = os.path.join(tmp, f"{label}.db")
+            result = import_file(src, db, workers=workers)
+            out[f"import_{label}_rows_per_s"] = result.read / result.seconds
+        store = CompoundStore(db)
+        try:
+            t = time.perf_counter()
+            export_file(store, os.path.join(tmp, "out.csv"))
+            out["export_rows_per_s"] = n / (time.perf_counter() - t)
+        finally:
+            store.close()
+    return out
+
+
+# =====================================
+# 페이지 전체 재실행 (Streamlit AppTest)
+# =====================================
+def bench_rerun(page: str = "main.py", repeat: int = 5) -> dict:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {}
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), page)
+    t = time.perf_counter()
+    at = AppTest.from_file(path, default_timeout=60).run()
+    first = time.perf_counter() - t
+    runs = []
+    for q in ["H2O", "소금", "염화 나트륨", "CH3CH2OH", "에타놀"][:repeat]:
+        t = time.perf_counter()
+        at.text_input[0].input(q).run()
+        runs.append(time.perf_counter() - t)
+    if at.exception:
+        raise RuntimeError(f"{page} 실행 중 예외: {at.exception[0].value}")
+    return {"rerun_first_ms": first * 1e3, "rerun_search_ms": statistics.median(runs) * 1e3}
+
+
+# =====================================
+# 실행 / 비교
+# =====================================
+SUITES = {"parser": bench_parser, "parse_kinds": bench_parse_kinds, "mass": bench_mass,
+          "isotopes": bench_isotopes,
+          "lookup": bench_lookup, "snapshot": bench_snapshot, "import": bench_import, "rerun": bench_rerun}
+
+
+def run(only=None, quick: bool = False) -> dict:
+    metrics = {}
+    for name, fn in SUITES.items():
+        if only and name not in only:
+            continue
+        result = fn(10_000) if quick and name in ("mass", "lookup", "snapshot", "import") else fn()
+        metrics.update({f"{name}.{k}": v for k, v in result.items()})
+    return {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                     "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "quick": quick},
+            "metrics": metrics}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    # 느려진 지표 목록 — *_per_s, *speedup 은 클수록 좋고 나머지(시간)는 작을수록 좋다
+    regressions = []
+    for name, base in baseline.get("metrics", {}).items():
+        cur = current["metrics"].get(name)
+        if cur is None or not base:
+            continue
+        higher_is_better = name.endswith("_per_s") or name.endswith("speedup")
+        ratio = base / cur if higher_is_better else cur / base
+        if ratio > threshold:
+            regressions.append((name, base, cur, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="화합물 사전 성능 측정")
+    parser.add_argument("--quick", action="store_true", help="대용량 항목을 1만 건으로 줄여 실행")
+    parser.add_argument("--only", help="실행할 묶음 (쉼표 구분): " + ", ".join(SUITES))
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로 ('-'면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 기준 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=1.25, help="회귀로 볼 배율 (기본 1.25)")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(",")) if args.only else None
+    result = run(only, args.quick)
+    if args.json == "-":
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for name, value in result["metrics"].items():
+            print(f"{name:45s} {value:12.3f}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as fp:
+                json.dump(result, fp, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        regressions = compare(result, baseline, args.threshold)
+        for name, base, cur, ratio in regressions:
+            print(f"회귀: {name} {base:.3f} → {cur:.3f} (x{ratio:.2f})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
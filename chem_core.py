@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# 화합물 사전 핵심 로직 — Streamlit 없이 import 가능 (UI·HTTP API가 같은 엔진을 공유)
+import os
+import threading
+from functools import lru_cache
+
+import metrics
+from compound_store import open_default_store
+from elements import element_info
+from formula_engine import cache_stats, get_composition
+from name_index import NameIndex
+from reverse_index import ReverseIndex
+from snapshot import DEFAULT_DIR, SnapshotWatcher
+
+
+class ChemCore:
+    # 저장소 버전 하나에 묶인 검색 엔진, 색인은 처음 쓸 때 만든다
+    # lookup()/composition() 결과는 캐시에서 공유되므로 읽기 전용으로 다룬다
+    # 스냅숏에서 열 때는 매핑된 색인을 그대로 넘겨받는다
+    def __init__(self, store, name_index=None, reverse_index=None):
+        self.store = store
+        self.version = store.version
+        self._lock = threading.Lock()
+        self._name_index = name_index
+        self._reverse_index = reverse_index
+        self.lookup = lru_cache(maxsize=8192)(self._lookup)
+        self.composition = lru_cache(maxsize=8192)(self._composition)
+        metrics.register_cache("formula", cache_stats)
+        metrics.register_cache("lookup", self.lookup.cache_info)
+        metrics.register_cache("composition", self.composition.cache_info)
+
+    @property
+    def name_index(self) -> NameIndex:
+        if self._name_index is None:
+            with self._lock:
+                if self._name_index is None:
+                    self._name_index = NameIndex.from_store(self.store)
+        return self._name_index
+
+    @property
+    def reverse_index(self) -> ReverseIndex:
+        if self._reverse_index is None:
+            with self._lock:
+                if self._reverse_index is None:
+                    self._reverse_index = ReverseIndex.from_store(self.store)
+        return self._reverse_index
+
+    def _lookup(self, query: str) -> dict:
+        # formula: 찾은 화학식 (없으면 None), matches: 같은 조성의 후보 전체
+        # suggestions: 못 찾았을 때 이름 색인이 추천한 (이름, 화학식, 점수)
+        query = query.strip()
+        with metrics.span("lookup.store"):
+            matches = self.store.resolve_all(query)
+        suggestions = []
+        if not matches:
+            # 띄어쓰기·오타·일부 입력은 이름 색인으로 다시 찾는다
+            with metrics.span("lookup.fuzzy"):
+                suggestions = self.name_index.search(query, 5)
+            if suggestions and suggestions[0][2] >= 3.0:
+                matches = [suggestions[0][1]]
+        formula = matches[0] if matches else None
+        return {"query": query, "formula": formula, "matches": matches,
+                "suggestions": suggestions,
+                "record": self.store.get(formula) if formula else None}
+
+    def _composition(self, formula: str) -> dict:
+        # 파싱 오류는 ValueError 그대로 올린다 (parse·mass 구간은 조성 캐시가 실패할 때 잰다)
+        comp = get_composition(formula)
+        elements = []
+        for el, count in comp.counts:
+            data = element_info(el)
+            elements.append({"symbol": el, "name": data[1] if data else None, "count": count,
+                             "mass": round(data[0] * count, 6) if data else None})
+        return {"formula": comp.formula, "key": comp.key, "charge": comp.charge,
+                "mass": comp.mass, "elements": elements, "unknown": list(comp.unknown)}
+
+    def find(self, mass: float = None, tol: float = 0.1, include=(), exclude=(),
+             limit: int = 50) -> list:
+        return self.reverse_index.query(mass, tol, include, exclude, limit)
+
+    def isotopes(self, formula: str, threshold: float = 1e-6, min_relative: float = 0.01) -> dict:
+        # numpy는 동위원소 분포를 쓸 때만 불러온다, 결과는 조성 키별로 캐시된다
+        from isotope_pattern import cache_info, isotope_pattern
+        metrics.register_cache("isotope", cache_info)
+        with metrics.span("isotopes"):
+            pat = isotope_pattern(formula, threshold)
+        return {"key": pat.key, "charge": pat.charge, "monoisotopic": pat.monoisotopic,
+                "average": pat.average, "most_abundant": pat.most_abundant,
+                "peaks": [{"mz": m, "relative": r} for m, r in pat.peaks(min_relative)]}
+
+    def batch_mass(self, formulas) -> dict:
+        # numpy는 배치 API를 쓸 때만 불러온다
+        from batch import batch_compose
+        result = batch_compose(formulas)
+        masses = [None if m != m else float(m) for m in result.masses.tolist()]
+        return {"masses": masses,
+                "errors": [{"row": r, "formula": f, "error": e} for r, f, e in result.errors]}
+
+
+_core = None
+_core_snapshot = None
+_core_lock = threading.Lock()
+_watcher = SnapshotWatcher(os.environ.get("CHEM_SNAPSHOT_DIR", DEFAULT_DIR))
+
+
+def get_core() -> ChemCore:
+    # 프로세스당 하나 — 게시된 스냅숏이 있으면 그것을 열고, 새 스냅숏이 게시되면 다음 호출부터 갈아탄다
+    # 스냅숏이 없으면 원본 저장소를 열고 색인은 처음 쓸 때 만든다
+    global _core, _core_snapshot
+    snap = _watcher.current()
+    if snap is not None:
+        if snap is not _core_snapshot:
+            with _core_lock:
+                if snap is not _core_snapshot:
+                    _core = ChemCore(snap.store, snap.name_index, snap.reverse_index)
+                    _core_snapshot = snap
+        return _core
+    if _core is None or _core_snapshot is not None:
+        with _core_lock:
+            if _core is None or _core_snapshot is not None:
+                _core = ChemCore(open_default_store())
+                _core_snapshot = None
+    return _core
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+# 화합물 저장소: SQLite 파일 기반, 화학식 기본 키 + 이름/동의어/종류/상태 보조 인덱스
+import json
+import os
+import shutil
+import sqlite3
+import threading
+
+import metrics
+from formula_engine import canonical_key, get_composition
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_SOURCE = os.path.join(DATA_DIR, 'compounds.jsonl')
+DEFAULT_DB = os.path.join(DATA_DIR, 'compounds.db')
+
+# 레코드 키 (화면에 그대로 쓰는 한글 키) → 컬럼
+FIELDS = (("화학식", "formula"), ("이름", "name"), ("상태(상온)", "state"), ("종류", "kind"),
+          ("설명", "description"), ("물리적 성질", "physical"), ("안전", "safety"))
+_COLUMNS = ", ".join(col for _, col in FIELDS)
+
+# 스키마가 바뀌면 올린다 — 기존 DB 파일은 다음 실행 때 다시 만들어진다
+SCHEMA_VERSION = '3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS compounds (
+    formula TEXT PRIMARY KEY, name TEXT NOT NULL, state TEXT, kind TEXT,
+    description TEXT, physical TEXT, safety TEXT, pos INTEGER NOT NULL, hill_key TEXT,
+    mass REAL, composition TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS synonyms (
+    synonym TEXT NOT NULL, formula TEXT NOT NULL REFERENCES compounds(formula),
+    PRIMARY KEY (synonym, formula)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+"""
+
+# 보조 인덱스 — 새로 만들 때는 행을 다 넣은 뒤에 한 번에 만든다
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_compounds_name ON compounds(name);
+CREATE INDEX IF NOT EXISTS idx_compounds_kind ON compounds(kind);
+CREATE INDEX IF NOT EXISTS idx_compounds_state ON compounds(state);
+CREATE INDEX IF NOT EXISTS idx_compounds_pos ON compounds(pos);
+CREATE INDEX IF NOT EXISTS idx_compounds_hill_key ON compounds(hill_key);
+CREATE INDEX IF NOT EXISTS idx_synonyms_formula ON synonyms(formula);
+"""
+
+
+# 파생 필드 — 저장할 때 한 번 계산해 둔다 (화학식 오류면 모두 None)
+DERIVED = (("조성 키", "hill_key"), ("몰질량", "mass"), ("조성", "composition"))
+_ROW_COLUMNS = _COLUMNS + ", " + ", ".join(col for _, col in DERIVED)
+_INSERT = (f"INSERT OR REPLACE INTO compounds ({_ROW_COLUMNS}, pos) VALUES "
+           f"({', '.join('?' * (len(FIELDS) + len(DERIVED) + 1))})")
+
+
+def _row_to_record(row):
+    return {key: row[i] for i, (key, _) in enumerate(FIELDS)}
+
+
+def derive_fields(formula: str, comp=None) -> tuple:
+    # (조성 키, 몰질량, 조성 JSON) — 파싱 오류는 ValueError 그대로
+    if comp is None:
+        comp = get_composition(formula)
+    return (comp.key, round(comp.mass, 6),
+            json.dumps(dict(comp.counts), ensure_ascii=False, separators=(',', ':')))
+
+
+def record_to_row(rec: dict, derived: tuple = None) -> tuple:
+    # 레코드 → 쓰기용 행 (필드..., 조성 키, 몰질량, 조성, 동의어 튜플)
+    # derived를 주지 않으면 여기서 계산하고, 해석할 수 없는 화학식은 파생 필드를 비운다
+    if "화학식" not in rec or "이름" not in rec:
+        raise ValueError(f"'화학식'과 '이름'은 필수입니다: {rec!r}")
+    if derived is None:
+        try:
+            derived = derive_fields(rec["화학식"])
+        except ValueError:
+            derived = (None, None, None)
+    synonyms = rec.get("동의어", ())
+    if isinstance(synonyms, str):
+        synonyms = (synonyms,)
+    return tuple(rec.get(k) for k, _ in FIELDS) + tuple(derived) + (tuple(synonyms),)
+
+
+# =====================================
+# 읽기 전용 저장소
+# =====================================
+class CompoundStore:
+    # 필요한 행만 그때그때 조회하므로 여는 비용은 데이터베이스 크기와 무관
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        # 파일을 메모리 매핑으로 읽어 같은 DB를 연 프로세스들이 페이지 캐시를 나눠 쓴다
+        self._conn.execute("PRAGMA mmap_size = 268435456")
+        self._lock = threading.Lock()
+        self.version = self._query_one("SELECT value FROM meta WHERE key = 'version'") or '0'
+        self.schema = self._query_one("SELECT value FROM meta WHERE key = 'schema'") or '1'
+        # 'import'면 importer.py로 채운 DB — 원본 JSONL의 캐시가 아니므로 다시 만들지 않는다
+        self.source = self._query_one("SELECT value FROM meta WHERE key = 'source'")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _query_one(self, sql, params=()):
+        rows = self._query(sql, params)
+        return rows[0][0] if rows else None
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        return self._query_one("SELECT COUNT(*) FROM compounds")
+
+    def __contains__(self, formula):
+        return self.get(formula) is not None
+
+    def get(self, formula: str):
+        # 화학식(기본 키)으로 레코드 조회, 없으면 None
+        rows = self._query(f"SELECT {_COLUMNS} FROM compounds WHERE formula = ?", (formula,))
+        return _row_to_record(rows[0]) if rows else None
+
+    def formulas_by_name(self, name: str) -> list:
+        # 대표 이름 또는 동의어가 정확히 일치하는 화학식들
+        rows = self._query(
+            "SELECT formula FROM synonyms WHERE synonym = ? "
+            "UNION SELECT formula FROM compounds WHERE name = ?", (name, name))
+        return [r[0] for r in rows]
+
+    def formulas_by_key(self, key: str) -> list:
+        # 같은 Hill 조성 키를 가진 화학식들 (이성질체 포함), 원본 순서
+        return [r[0] for r in self._query(
+            "SELECT formula FROM compounds WHERE hill_key = ? ORDER BY pos", (key,))]
+
+    def resolve_all(self, query: str) -> list:
+        # 화학식 → 동의어 → 대표 이름 → 조성 키 순으로 찾아 화학식 목록을 돌려준다
+        query = query.strip()
+        if self.get(query) is not None:
+            return [query]
+        found = self.formulas_by_name(query)
+        if found:
+            return found
+        try:
+            with metrics.span("normalize"):
+                key = canonical_key(query)
+        except ValueError:
+            return []
+        return self.formulas_by_key(key)
+
+    def resolve(self, query: str):
+        found = self.resolve_all(query)
+        return found[0] if found else None
+
+    def duplicate_groups(self) -> list:
+        # 조성 키가 같은 레코드 묶음 — 중복 입력과 이성질체를 한꺼번에 점검할 때
+        rows = self._query(
+            "SELECT hill_key, group_concat(formula, ' ') FROM compounds "
+            "WHERE hill_key IS NOT NULL GROUP BY hill_key HAVING COUNT(*) > 1")
+        return [(key, formulas.split(' ')) for key, formulas in rows]
+
+    def iter_names(self, batch: int = 5000):
+        # (이름 또는 동의어, 화학식) 쌍 — 검색 색인 생성용
+        for table, column in (("compounds", "name"), ("synonyms", "synonym")):
+            last = ('', '')
+            while True:
+                rows = self._query(
+                    f"SELECT {column}, formula FROM {table} WHERE ({column}, formula) > (?, ?) "
+                    f"ORDER BY {column}, formula LIMIT ?", (*last, batch))
+                if not rows:
+                    break
+                yield from rows
+                last = rows[-1]
+
+    def synonyms(self, formula: str) -> list:
+        return [r[0] for r in self._query(
+            "SELECT synonym FROM synonyms WHERE formula = ? ORDER BY synonym", (formula,))]
+
+    def by_kind(self, kind: str, limit: int = 100, offset: int = 0) -> list:
+        return [_row_to_record(r) for r in self._query(
+            f"SELECT {_COLUMNS} FROM compounds WHERE kind = ? ORDER BY formula LIMIT ? OFFSET ?",
+            (kind, limit, offset))]
+
+    def by_state(self, state: str, limit: int = 100, offset: int = 0) -> list:
+        return [_row_to_record(r) for r in self._query(
+            f"SELECT {_COLUMNS} FROM compounds WHERE state = ? ORDER BY formula LIMIT ? OFFSET ?",
+            (state, limit, offset))]
+
+    def page(self, limit: int = 100, offset: int = 0) -> list:
+        # 원본 파일 순서대로 한 페이지
+        return [_row_to_record(r) for r in self._query(
+            f"SELECT {_COLUMNS} FROM compounds ORDER BY pos LIMIT ? OFFSET ?", (limit, offset))]
+
+    def iter_records(self, batch: int = 1000):
+        # pos 기준 키셋 페이지네이션 — OFFSET 없이 끝까지 순회
+        last = -1
+        while True:
+            rows = self._query(
+                f"SELECT {_COLUMNS}, pos FROM compounds WHERE pos > ? ORDER BY pos LIMIT ?",
+                (last, batch))
+            if not rows:
+                return
+            for r in rows:
+                yield _row_to_record(r)
+            last = rows[-1][-1]
+
+    def iter_full_records(self, batch: int = 1000):
+        # 내보내기용: 동의어와 파생 필드까지 붙인 레코드, 원본 순서
+        n = len(FIELDS) + len(DERIVED)
+        last = -1
+        while True:
+            rows = self._query(
+                f"SELECT {_ROW_COLUMNS}, (SELECT group_concat(synonym, char(31)) FROM synonyms s "
+                f"WHERE s.formula = c.formula), pos FROM compounds c WHERE pos > ? "
+                f"ORDER BY pos LIMIT ?", (last, batch))
+            if not rows:
+                return
+            for r in rows:
+                rec = _row_to_record(r)
+                rec["동의어"] = r[n].split('\x1f') if r[n] else []
+                for i, (key, _) in enumerate(DERIVED, len(FIELDS)):
+                    rec[key] = json.loads(r[i]) if key == "조성" and r[i] else r[i]
+                yield rec
+            last = rows[-1][-1]
+
+
+# =====================================
+# 생성 (JSONL → SQLite)
+# =====================================
+def load_records(path: str = DEFAULT_SOURCE):
+    # 한 줄에 레코드 하나인 JSONL 파일을 스트리밍으로 읽는다
+    with open(path, encoding='utf-8') as fp:
+        for lineno, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: JSON 오류 ({e})") from None
+
+
+class StoreWriter:
+    # 대량 쓰기: 임시 파일에 묶음마다 executemany + 커밋, commit()에서 원자적으로 교체
+    # 교체 전까지 읽는 프로세스는 이전 파일을 계속 쓴다 / append=True면 기존 DB에 이어 쓴다
+    def __init__(self, db_path: str, append: bool = False):
+        self.db_path = db_path
+        self.tmp = f"{db_path}.{os.getpid()}.tmp"
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+        if append and os.path.exists(db_path):
+            shutil.copyfile(db_path, self.tmp)
+        self._conn = sqlite3.connect(self.tmp)
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute("PRAGMA cache_size = -65536")
+        self._conn.executescript(SCHEMA)
+        self.pos = self._conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM compounds").fetchone()[0]
+
+    def write_rows(self, rows):
+        # rows: record_to_row() 형식, 한 트랜잭션으로 기록
+        pos = self.pos
+        compounds, synonyms = [], []
+        for row in rows:
+            compounds.append(row[:-1] + (pos,))
+            synonyms.extend((s, row[0]) for s in row[-1])
+            pos += 1
+        with self._conn:
+            self._conn.executemany(_INSERT, compounds)
+            self._conn.executemany("INSERT OR IGNORE INTO synonyms VALUES (?, ?)", synonyms)
+        self.pos = pos
+
+    def existing(self, formulas) -> set:
+        # 이미 기록된(이어 쓰기면 기존 DB에 있던 것 포함) 화학식
+        formulas = list(formulas)
+        found = set()
+        for i in range(0, len(formulas), 500):
+            part = formulas[i:i + 500]
+            found.update(f for f, in self._conn.execute(
+                f"SELECT formula FROM compounds WHERE formula IN ({', '.join('?' * len(part))})",
+                part))
+        return found
+
+    def write_records(self, records):
+        self.write_rows([record_to_row(rec) for rec in records])
+
+    def commit(self, version: str = None, source: str = None):
+        # version: 렌더링 캐시 등이 무효화 키로 쓰는 데이터 버전 문자열
+        # source: 'import'면 open_default_store()가 이 DB를 원본 JSONL로 다시 만들지 않는다
+        self._conn.executescript(INDEXES)
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                               (version or str(self.pos),))
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)",
+                               (SCHEMA_VERSION,))
+            if source:
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (source,))
+        self._conn.close()
+        os.replace(self.tmp, self.db_path)
+
+    def abort(self):
+        self._conn.close()
+        if os.path.exists(self.tmp):
+            os.remove(self.tmp)
+
+
+def build_store(db_path: str, records, version: str = None, batch: int = 5000):
+    writer = StoreWriter(db_path)
+    try:
+        rows = []
+        for rec in records:
+            rows.append(record_to_row(rec))
+            if len(rows) >= batch:
+                writer.write_rows(rows)
+                rows = []
+        writer.write_rows(rows)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.commit(version)
+
+
+def open_default_store() -> CompoundStore:
+    # 원본 JSONL이 DB보다 새롭거나 스키마가 바뀌었으면 다시 만든다
+    # importer.py로 가져온 DB는 원본이 따로 없으므로 덮어쓰지 않는다 (스키마가 다르면 오류)
+    if os.path.exists(DEFAULT_DB):
+        store = CompoundStore(DEFAULT_DB)
+        if store.source == 'import':
+            if store.schema == SCHEMA_VERSION:
+                return store
+            store.close()
+            raise RuntimeError(f"{DEFAULT_DB}는 가져온 데이터인데 스키마({store.schema})가 "
+                               f"현재({SCHEMA_VERSION})와 다릅니다 — 내보낸 뒤 다시 가져오세요.")
+        if (store.schema == SCHEMA_VERSION
+                and os.path.getmtime(DEFAULT_DB) >= os.path.getmtime(DEFAULT_SOURCE)):
+            return store
+        store.close()
+    build_store(DEFAULT_DB, load_records(DEFAULT_SOURCE),
+                version=str(int(os.path.getmtime(DEFAULT_SOURCE))))
+    return CompoundStore(DEFAULT_DB)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# 원소 저장소: 원자 번호로 바로 접근하는 병렬 배열 (프로세스당 한 번만 로드)
+from array import array
+
+from isotopes import isotope_mass
+
+# =====================================
+# 원소 데이터 (원자 번호 순, 표준 원자량 / 방사성 원소는 가장 안정한 동위원소의 질량수)
+# =====================================
+_TABLE = """\
+H 1.008 수소|He 4.0026 헬륨|Li 6.94 리튬|Be 9.0122 베릴륨|B 10.81 붕소|C 12.011 탄소|
+N 14.007 질소|O 15.999 산소|F 18.998 플루오린|Ne 20.180 네온|Na 22.990 나트륨|
+Mg 24.305 마그네슘|Al 26.982 알루미늄|Si 28.085 규소|P 30.974 인|S 32.06 황|Cl 35.45 염소|
+Ar 39.948 아르곤|K 39.098 칼륨|Ca 40.078 칼슘|Sc 44.956 스칸듐|Ti 47.867 타이타늄|
+V 50.942 바나듐|Cr 51.996 크로뮴|Mn 54.938 망가니즈|Fe 55.845 철|Co 58.933 코발트|
+Ni 58.693 니켈|Cu 63.546 구리|Zn 65.38 아연|Ga 69.723 갈륨|Ge 72.630 저마늄|As 74.922 비소|
+Se 78.971 셀레늄|Br 79.904 브로민|Kr 83.798 크립톤|Rb 85.468 루비듐|Sr 87.62 스트론튬|
+Y 88.906 이트륨|Zr 91.224 지르코늄|Nb 92.906 나이오븀|Mo 95.95 몰리브데넘|Tc 98 테크네튬|
+Ru 101.07 루테늄|Rh 102.91 로듐|Pd 106.42 팔라듐|Ag 107.87 은|Cd 112.41 카드뮴|In 114.82 인듐|
+Sn 118.71 주석|Sb 121.76 안티모니|Te 127.60 텔루륨|I 126.90 아이오딘|Xe 131.29 제논|
+Cs 132.91 세슘|Ba 137.33 바륨|La 138.91 란타넘|Ce 140.12 세륨|Pr 140.91 프라세오디뮴|
+Nd 144.24 네오디뮴|Pm 145 프로메튬|Sm 150.36 사마륨|Eu 151.96 유로퓸|Gd 157.25 가돌리늄|
+Tb 158.93 터븀|Dy 162.50 디스프로슘|Ho 164.93 홀뮴|Er 167.26 어븀|Tm 168.93 툴륨|
+Yb 173.05 이터븀|Lu 174.97 루테튬|Hf 178.49 하프늄|Ta 180.95 탄탈럼|W 183.84 텅스텐|
+Re 186.21 레늄|Os 190.23 오스뮴|Ir 192.22 이리듐|Pt 195.08 백금|Au 196.97 금|Hg 200.59 수은|
+Tl 204.38 탈륨|Pb 207.2 납|Bi 208.98 비스무트|Po 209 폴로늄|At 210 아스타틴|Rn 222 라돈|
+Fr 223 프랑슘|Ra 226 라듐|Ac 227 악티늄|Th 232.04 토륨|Pa 231.04 프로트악티늄|U 238.03 우라늄|
+Np 237 넵투늄|Pu 244 플루토늄|Am 243 아메리슘|Cm 247 퀴륨|Bk 247 버클륨|Cf 251 캘리포늄|
+Es 252 아인슈타이늄|Fm 257 페르뮴|Md 258 멘델레븀|No 259 노벨륨|Lr 262 로렌슘|
+Rf 267 러더포듐|Db 270 더브늄|Sg 269 시보귬|Bh 270 보륨|Hs 270 하슘|Mt 278 마이트너륨|
+Ds 281 다름슈타튬|Rg 281 뢴트게늄|Cn 285 코페르니슘|Nh 286 니호늄|Fl 289 플레로븀|
+Mc 290 모스코븀|Lv 293 리버모륨|Ts 294 테네신|Og 294 오가네손"""
+
+
+def _load():
+    # 인덱스 0은 비워 두어 원자 번호가 곧 배열 인덱스가 되도록 한다
+    symbols, names, masses = [''], [''], array('d', [0.0])
+    for entry in _TABLE.replace('\n', '').split('|'):
+        sym, mass, name = entry.split()
+        symbols.append(sym)
+        names.append(name)
+        masses.append(float(mass))
+    return tuple(symbols), tuple(names), masses
+
+
+SYMBOLS, NAMES_KR, MASSES = _load()
+SYMBOL_INDEX = {sym: z for z, sym in enumerate(SYMBOLS) if sym}
+N_ELEMENTS = len(SYMBOLS) - 1
+
+
+def atomic_number(symbol: str):
+    # 없는 기호는 None
+    return SYMBOL_INDEX.get(symbol)
+
+
+def element_info(symbol: str):
+    # (원자량, 한글 이름) 또는 None — 동위원소 라벨은 해당 동위원소의 질량
+    z = SYMBOL_INDEX.get(symbol)
+    if z is None:
+        iso = isotope_info(symbol)
+        return None if iso is None else iso[1:]
+    return MASSES[z], NAMES_KR[z]
+
+
+def mass_of(zcounts) -> float:
+    # (원자 번호, 개수) 희소 벡터와 원자량 배열의 내적
+    masses = MASSES
+    return sum(masses[z] * n for z, n in zcounts)
+
+
+# =====================================
+# 동위원소 라벨 ('2H', '13C' ...)
+# =====================================
+# 정확한 질량을 아는 동위원소(isotopes 표)만 받는다 — 질량수로 어림한 몰질량은 내놓지 않는다
+def isotope_info(label: str):
+    # (원자 번호, 질량, 한글 이름) 또는 None — '013C'처럼 앞에 0이 붙어도 '13C'와 같다
+    i = 0
+    while i < len(label) and label[i].isdigit():
+        i += 1
+    z = SYMBOL_INDEX.get(label[i:])
+    if i == 0 or z is None:
+        return None
+    a = int(label[:i])
+    mass = isotope_mass(f"{a}{SYMBOLS[z]}")
+    if mass is None:
+        return None
+    return z, mass, f"{NAMES_KR[z]}-{a}"
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+# 화학식 엔진: 단일 패스 스캐너 + 불변 조성 객체 + LRU 캐시
+import threading
+from collections import OrderedDict
+
+import metrics
+from elements import MASSES, SYMBOL_INDEX, SYMBOLS, isotope_info
+
+_set = object.__setattr__
+
+# =====================================
+# 조성 객체
+# =====================================
+class Composition:
+    # counts: (원소 또는 동위원소 라벨, 개수) 튜플 — 화학식에 처음 등장한 순서 유지
+    # zcounts: (원자 번호, 개수) 희소 벡터 — 동위원소는 원래 원소 번호로 합산
+    # mass: 몰질량 (원자량 배열과의 내적, 동위원소 라벨은 해당 동위원소 질량)
+    # charge: 이온 전하 (중성이면 0)
+    # unknown: 원소 저장소에 없는 기호
+    # key: Hill 순서 조성 키 — 표기가 달라도 조성이 같으면 같은 값 (동등 비교·해시 기준)
+    __slots__ = ('formula', 'counts', 'zcounts', 'mass', 'charge', 'unknown', 'key', '_hash')
+
+    def __init__(self, formula: str, counts: tuple, charge: int = 0):
+        zcounts = {}
+        unknown = []
+        mass = 0.0
+        for el, n in counts:
+            z = SYMBOL_INDEX.get(el)
+            if z is not None:
+                m = MASSES[z]
+            else:
+                iso = isotope_info(el)
+                if iso is None:
+                    unknown.append(el)
+                    continue
+                z, m = iso[0], iso[1]
+            zcounts[z] = zcounts.get(z, 0) + n
+            mass += m * n
+        _set(self, 'formula', formula)
+        _set(self, 'counts', counts)
+        _set(self, 'zcounts', tuple(zcounts.items()))
+        _set(self, 'mass', mass)
+        _set(self, 'charge', charge)
+        _set(self, 'unknown', tuple(unknown))
+        key = hill_key(counts, charge)
+        _set(self, 'key', key)
+        _set(self, '_hash', hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Composition 객체는 변경할 수 없습니다.")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Composition):
+            return NotImplemented
+        return self.key == other.key
+
+    def __repr__(self):
+        return f"Composition({self.formula!r}, mass={self.mass:.3f})"
+
+    def as_dict(self):
+        return dict(self.counts)
+
+
+# =====================================
+# Hill 순서 조성 키
+# =====================================
+def _base_symbol(el: str):
+    # ('C', 0) / 동위원소 라벨 '13C' → ('C', 13)
+    if not el[0].isdigit():
+        return el, 0
+    iso = isotope_info(el)
+    if iso is None:
+        return el, 0
+    base = SYMBOLS[iso[0]]
+    return base, int(el[:-len(base)])
+
+
+def hill_key(counts, charge: int = 0) -> str:
+    # 탄소가 있으면 C, H 다음 알파벳 순, 없으면 전부 알파벳 순 (Hill 표기)
+    # 동위원소는 [13C] 처럼 원래 원소 바로 뒤에, 전하는 ^2- 형태로 붙인다 — 다시 파싱 가능
+    items = [(_base_symbol(el), el, n) for el, n in counts]
+    has_carbon = any(base == 'C' for (base, _), _, _ in items)
+
+    def order(item):
+        base, a = item[0]
+        if has_carbon and base in ('C', 'H'):
+            return (0 if base == 'C' else 1, base, a)
+        return (2, base, a)
+
+    parts = []
+    for _, el, n in sorted(items, key=order):
+        parts.append(f"[{el}]" if el[0].isdigit() else el)
+        if n != 1:
+            parts.append(str(n))
+    if charge:
+        mag = abs(charge)
+        parts.append(f"^{mag if mag != 1 else ''}{'+' if charge > 0 else '-'}")
+    return ''.join(parts)
+
+
+# =====================================
+# 단일 패스 스캐너
+# =====================================
+def normalize_formula(formula: str) -> str:
+    return ''.join(formula.split())
+
+
+# 문법 (공백 무시, 한 번의 왼쪽→오른쪽 스캔):
+#   화학식   := 성분 (구분자 성분)* 전하?
+#   성분     := 계수? 항목+                 예) 2H2O, CuSO4·5H2O 의 5H2O
+#   항목     := 원소 개수? | 여는괄호 동위원소? 항목+ 닫는괄호 개수?
+#   원소     := 대문자 소문자? (D, T 는 2H, 3H)
+#   동위원소 := 여는 괄호 바로 뒤의 질량수    예) [13C]H4, [18O]2
+#   전하     := (^ 숫자?)? (+|-)+ — 끝에만 허용. 원소 뒤 숫자는 항상 개수이고 부호 하나가 1가
+#               예) NH4+, SO4--, Fe^3+, SO4^2-, 닫는 괄호 뒤는 숫자가 전하: [Fe(CN)6]3-
+# 괄호는 (), [], {} 세 종류를 짝 맞춰 중첩할 수 있고 구분자는 · • . * 를 쓴다.
+_UPPER = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_LOWER = frozenset('abcdefghijklmnopqrstuvwxyz')
+_DIGITS = frozenset('0123456789')
+_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+_CLOSERS = frozenset(')]}')
+_SEPARATORS = frozenset('·•.*')
+_SIGNS = frozenset('+-')
+_ALIASES = {'D': '2H', 'T': '3H'}
+
+
+def _read_charge(formula: str, i: int, digits: str) -> int:
+    # formula[i:]는 부호로만 이루어져야 한다 (끝 위치 전하)
+    tail = formula[i:]
+    sign = tail[0]
+    if tail.strip(sign):
+        raise ValueError("전하 표기는 화학식 끝에만 올 수 있습니다.")
+    mag = int(digits) if digits else len(tail)
+    return mag if sign == '+' else -mag
+
+
+def _count(digits: str) -> int:
+    n = int(digits)
+    if n == 0:
+        raise ValueError("개수는 0일 수 없습니다.")
+    return n
+
+
+def _scan(formula: str) -> tuple:
+    # 토큰 리스트 없이 문자 단위로 한 번만 훑으며 괄호 스택에 개수를 쌓는다
+    # 반환값: ((원소 또는 동위원소 라벨, 개수), ...), 전하
+    upper, lower, digits, signs = _UPPER, _LOWER, _DIGITS, _SIGNS
+    total = {}
+    stack = [{}]
+    closers = []
+    charge = 0
+    coef = 1
+    seg_start = True
+    i, n = 0, len(formula)
+    while i < n:
+        c = formula[i]
+        if c in upper:
+            j = i + 1
+            if j < n and formula[j] in lower:
+                j += 1
+            sym = formula[i:j]
+            sym = _ALIASES.get(sym, sym)
+            k = j
+            while k < n and formula[k] in digits:
+                k += 1
+            top = stack[-1]
+            top[sym] = top.get(sym, 0) + (_count(formula[j:k]) if k > j else 1)
+            seg_start = False
+            i = k
+        elif c in digits:
+            if not seg_start:
+                raise ValueError("숫자 위치가 올바르지 않습니다.")
+            k = i + 1
+            while k < n and formula[k] in digits:
+                k += 1
+            coef = int(formula[i:k])
+            if coef == 0:
+                raise ValueError("계수는 0일 수 없습니다.")
+            seg_start = False
+            i = k
+        elif c in _BRACKETS:
+            closers.append(_BRACKETS[c])
+            stack.append({})
+            seg_start = False
+            i += 1
+            if i < n and formula[i] in digits:
+                # 여는 괄호 바로 뒤의 숫자는 동위원소 질량수
+                k = i + 1
+                while k < n and formula[k] in digits:
+                    k += 1
+                if k >= n or formula[k] not in upper:
+                    raise ValueError("동위원소 질량수 뒤에는 원소 기호가 와야 합니다.")
+                j = k + 1
+                if j < n and formula[j] in lower:
+                    j += 1
+                label = str(int(formula[i:k])) + formula[k:j]  # '013C' → '13C' (조성 키가 같도록)
+                m = j
+                while m < n and formula[m] in digits:
+                    m += 1
+                top = stack[-1]
+                top[label] = top.get(label, 0) + (_count(formula[j:m]) if m > j else 1)
+                i = m
+        elif c in _CLOSERS:
+            if not closers or closers.pop() != c:
+                raise ValueError("괄호 처리 오류")
+            j = i + 1
+            k = j
+            while k < n and formula[k] in digits:
+                k += 1
+            if k < n and formula[k] in signs:
+                # 닫는 괄호 뒤 숫자 + 부호는 착이온의 전하
+                charge = _read_charge(formula, k, formula[j:k])
+                mult = 1
+                k = n
+            else:
+                mult = _count(formula[j:k]) if k > j else 1
+            group = stack.pop()
+            if not group:
+                raise ValueError("빈 괄호가 있습니다.")
+            top = stack[-1]
+            for sym, cnt in group.items():
+                top[sym] = top.get(sym, 0) + cnt * mult
+            i = k
+        elif c in _SEPARATORS:
+            if closers:
+                raise ValueError("괄호 처리 오류")
+            if not stack[0]:
+                raise ValueError("빈 성분이 있습니다.")
+            for sym, cnt in stack[0].items():
+                total[sym] = total.get(sym, 0) + cnt * coef
+            stack[0] = {}
+            coef = 1
+            seg_start = True
+            i += 1
+        elif c in signs or c == '^':
+            if c == '^':
+                k = i + 1
+                while k < n and formula[k] in digits:
+                    k += 1
+                if k >= n or formula[k] not in signs:
+                    raise ValueError("'^' 뒤에는 전하가 와야 합니다.")
+                charge = _read_charge(formula, k, formula[i + 1:k])
+            else:
+                charge = _read_charge(formula, i, '')
+            i = n
+        else:
+            raise ValueError(f"알 수 없는 문자: {c!r}")
+    if closers:
+        raise ValueError("괄호 처리 오류")
+    if not stack[0]:
+        raise ValueError("빈 화학식입니다." if not total else "빈 성분이 있습니다.")
+    if coef == 1 and not total:
+        return tuple(stack[0].items()), charge
+    for sym, cnt in stack[0].items():
+        total[sym] = total.get(sym, 0) + cnt * coef
+    return tuple(total.items()), charge
+
+
+# =====================================
+# LRU 캐시
+# =====================================
+class FormulaCache:
+    # 정규화된 화학식 문자열 → Composition (파싱 오류도 캐시해 반복 입력을 싸게 처리)
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, formula: str) -> Composition:
+        key = normalize_formula(formula)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is None:
+            # 캐시 실패일 때만 단계별로 잰다: parse(스캔) → mass(몰질량·조성 키 계산)
+            try:
+                with metrics.span("parse"):
+                    counts, charge = _scan(key)
+                with metrics.span("mass"):
+                    entry = Composition(key, counts, charge)
+            except ValueError as e:
+                entry = e
+            with self._lock:
+                self._data[key] = entry
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        if isinstance(entry, ValueError):
+            raise ValueError(str(entry))
+        return entry
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_CACHE = FormulaCache()
+
+
+def get_composition(formula: str) -> Composition:
+    return _CACHE.get(formula)
+
+
+def cache_stats() -> dict:
+    return _CACHE.stats()
+
+
+def parse_formula(formula: str):
+    # 기존 인터페이스 호환: {원소: 개수}
+    return get_composition(formula).as_dict()
+
+
+# =====================================
+# 정규화 (표기가 달라도 같은 레코드로)
+# =====================================
+# 소문자 입력을 나눌 때 우선하는 흔한 원소 (CO2 ↔ Co2, CaCO3 ↔ CAcO3 같은 모호함 해소)
+_COMMON = frozenset('H B C N O F Na Mg Al Si P S Cl K Ca Mn Fe Cu Zn Br Ag I Ba Li Ni Cr Pb Sn Hg D T'.split())
+
+
+def _recase(lowered: str):
+    # 동적 계획법: best[i] = lowered[i:]를 나누는 최소 비용 (흔한 원소 1, 나머지 3)
+    n = len(lowered)
+    best = [None] * (n + 1)
+    best[n] = (0, '')
+    for i in range(n - 1, -1, -1):
+        c = lowered[i]
+        if not c.isalpha():
+            if best[i + 1] is not None:
+                best[i] = (best[i + 1][0], c + best[i + 1][1])
+            continue
+        for width in (1, 2):
+            sym = lowered[i:i + width]
+            if len(sym) != width or not sym.isalpha() or best[i + width] is None:
+                continue
+            sym = sym.capitalize()
+            if sym not in SYMBOL_INDEX and sym not in ('D', 'T'):
+                continue
+            cost = best[i + width][0] + (1 if sym in _COMMON else 3)
+            if best[i] is None or cost < best[i][0]:
+                best[i] = (cost, sym + best[i + width][1])
+    return best[0][1] if best[0] else None
+
+
+def recase_formula(formula: str) -> str:
+    # 대문자가 하나도 없는 입력(c2h5oh, nacl)만 원소 기호 대소문자를 복원, 실패하면 원문 그대로
+    formula = normalize_formula(formula)
+    if any(c.isupper() for c in formula):
+        return formula
+    fixed = _recase(formula)
+    return fixed if fixed else formula
+
+
+def canonical_key(formula: str) -> str:
+    # C2H6O, CH3CH2OH, C2H5OH, c2h5oh → 'C2H6O'
+    return get_composition(recase_formula(formula)).key
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+# 대량 가져오기 / 내보내기 — 파일 크기와 무관하게 묶음 단위로 흘려 보낸다
+#   python importer.py import big.csv --db data/compounds.db --workers 4
+#   python importer.py import more.sdf --db data/compounds.db --append --rejects bad.jsonl
+#   python importer.py export out.jsonl --db data/compounds.db
+# 읽기(생성기) → 묶음 → 작업 프로세스에서 화학식 검증·파생 필드 계산 → 저장소에 일괄 기록
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from compound_store import (DEFAULT_DB, DERIVED, FIELDS, CompoundStore, StoreWriter, derive_fields,
+                            record_to_row)
+from formula_engine import Composition, _scan, normalize_formula
+
+# 영문 열 이름 → 레코드 키 (한글 키는 그대로 받는다)
+ALIASES = {col: key for key, col in FIELDS}
+ALIASES.update({"synonyms": "동의어", "molecular_formula": "화학식", "mf": "화학식"})
+SYNONYM_SEP = ';'
+
+
+def _key(name: str):
+    name = name.strip()
+    return ALIASES.get(name.lower().replace(' ', '_'), name)
+
+
+# =====================================
+# 읽기 — (줄 번호, 레코드) 생성기, 레코드 대신 문자열이면 그 줄의 오류 메시지
+# =====================================
+def read_jsonl(path: str):
+    with open(path, encoding='utf-8') as fp:
+        for lineno, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield lineno, f"JSON 오류 ({e})"
+                continue
+            yield lineno, rec if isinstance(rec, dict) else "객체가 아닌 줄"
+
+
+def read_csv(path: str):
+    # 동의어 열은 ';'로 구분
+    with open(path, encoding='utf-8-sig', newline='') as fp:
+        reader = csv.reader(fp)
+        header = [_key(h) for h in next(reader, [])]
+        for row in reader:
+            if not any(row):
+                continue
+            rec = {k: v for k, v in zip(header, row) if v != ''}
+            if "동의어" in rec:
+                rec["동의어"] = [s.strip() for s in rec["동의어"].split(SYNONYM_SEP) if s.strip()]
+            yield reader.line_num, rec
+
+
+def read_sdf(path: str):
+    # 몰파일 블록은 건너뛰고 '> <태그>' 데이터 항목만 읽는다, '$$$$'가 레코드 끝
+    # 이름 태그가 없으면 몰파일 첫 줄(제목)을 이름으로 쓴다
+    with open(path, encoding='utf-8') as fp:
+        start, title, rec, tag, in_mol = 1, None, {}, None, True
+        for lineno, line in enumerate(fp, 1):
+            line = line.rstrip('\r\n')
+            if line == '$$$$':
+                if title and "이름" not in rec:
+                    rec["이름"] = title
+                if "동의어" in rec:
+                    rec["동의어"] = [s.strip() for s in rec["동의어"].splitlines() if s.strip()]
+                if rec:
+                    yield start, rec
+                start, title, rec, tag, in_mol = lineno + 1, None, {}, None, True
+            elif in_mol:
+                if title is None:
+                    title = line.strip()
+                if line.startswith('M  END'):
+                    in_mol = False
+                elif line.startswith('>'):
+                    in_mol = False
+                    tag = _key(line[line.find('<') + 1:line.rfind('>')])
+            elif line.startswith('>'):
+                tag = _key(line[line.find('<') + 1:line.rfind('>')])
+            elif tag is not None:
+                if line.strip() == '':
+                    tag = None
+                else:
+                    rec[tag] = rec[tag] + '\n' + line if tag in rec else line
+        if rec:
+            yield start, rec
+
+
+READERS = {".jsonl": read_jsonl, ".json": read_jsonl, ".ndjson": read_jsonl,
+           ".csv": read_csv, ".sdf": read_sdf, ".sd": read_sdf}
+
+
+def open_reader(path: str, fmt: str = None):
+    ext = "." + fmt if fmt else os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"지원하지 않는 형식입니다: {ext} ({', '.join(READERS)})")
+    return READERS[ext](path)
+
+
+def chunked(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# =====================================
+# 검증 (작업 프로세스에서 실행)
+# =====================================
+def validate_chunk(chunk) -> tuple:
+    # [(줄 번호, 레코드)] → ([(줄 번호, 저장할 행)], [(줄 번호, 화학식, 오류)])
+    rows, errors = [], []
+    for lineno, rec in chunk:
+        if isinstance(rec, str):
+            errors.append((lineno, None, rec))
+            continue
+        formula, name = rec.get("화학식"), rec.get("이름")
+        if not isinstance(formula, str) or not isinstance(name, str):
+            errors.append((lineno, formula, "'화학식'과 '이름'은 문자열이어야 합니다."
+                           if formula is not None and name is not None
+                           else "'화학식'과 '이름'은 필수입니다."))
+            continue
+        formula = normalize_formula(formula)
+        synonyms = rec.get("동의어", ())
+        if isinstance(synonyms, str):  # JSONL의 "동의어": "소금" — 글자 단위로 쪼개지 않도록
+            synonyms = [synonyms]
+        if not formula or not name.strip():
+            errors.append((lineno, formula, "'화학식'과 '이름'은 필수입니다."))
+            continue
+        if not isinstance(synonyms, (list, tuple)) or not all(isinstance(s, str) for s in synonyms):
+            errors.append((lineno, formula, "'동의어'는 문자열 목록이어야 합니다."))
+            continue
+        rec = dict(rec, 화학식=formula, 이름=name.strip(), 동의어=synonyms)
+        try:
+            # 한 번만 보는 화학식이 대부분이라 공용 LRU 캐시를 거치지 않는다
+            comp = Composition(formula, *_scan(formula))
+            if comp.unknown:
+                raise ValueError(f"알 수 없는 원소: {', '.join(comp.unknown)}")
+            rows.append((lineno, record_to_row(rec, derive_fields(formula, comp))))
+        except ValueError as e:
+            errors.append((lineno, formula, str(e)))
+    return rows, errors
+
+
+class ImportResult:
+    __slots__ = ('read', 'written', 'rejected', 'samples', 'seconds')
+
+    def __init__(self):
+        self.read = self.written = self.rejected = 0
+        self.samples = []  # 처음 몇 개의 오류만 보관 (전체는 rejects 파일로)
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (f"ImportResult(read={self.read}, written={self.written}, "
+                f"rejected={self.rejected}, seconds={self.seconds:.2f})")
+
+
+def import_file(path: str, db_path: str = DEFAULT_DB, fmt: str = None, append: bool = False,
+                workers: int = None, chunk_size: int = 5000, progress=None, rejects: str = None,
+                version: str = None) -> ImportResult:
+    # workers=0이면 현재 프로세스에서 검증 (작은 파일·디버깅용)
+    # 진행 중인 묶음은 작업 수의 두 배까지만 두므로 메모리는 chunk_size에 비례
+    # progress(result)는 묶음을 기록할 때마다 불린다
+    # 실패하면 임시 파일을 지우고 기존 DB는 그대로 둔다
+    # 같은 화학식은 처음 것만 기록하고 나머지(이어 쓰기면 기존 DB에 있는 것도)는 거부 목록으로
+    # 가져온 DB는 source='import'로 표시되어 원본 JSONL로 다시 만들어지지 않는다
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    result = ImportResult()
+    t0 = time.perf_counter()
+    writer = StoreWriter(db_path, append)
+    reject_fp = open(rejects, 'w', encoding='utf-8') if rejects else None
+    seen = {}  # 화학식 → 처음 나온 줄 번호 — 같은 화학식은 덮어쓰지 않고 거부한다
+
+    def consume(rows, errors):
+        existing = writer.existing(row[0] for _, row in rows) if append else ()
+        fresh = []
+        for lineno, row in rows:
+            formula = row[0]
+            if formula in seen:
+                errors.append((lineno, formula, f"같은 화학식이 {seen[formula]}행에 이미 있습니다."))
+            elif formula in existing:
+                errors.append((lineno, formula, "저장소에 이미 있는 화학식입니다."))
+            else:
+                seen[formula] = lineno
+                fresh.append(row)
+        writer.write_rows(fresh)
+        result.written += len(fresh)
+        result.rejected += len(errors)
+        for lineno, formula, msg in errors:
+            if len(result.samples) < 20:
+                result.samples.append((lineno, formula, msg))
+            if reject_fp:
+                reject_fp.write(json.dumps({"line": lineno, "화학식": formula, "error": msg},
+                                           ensure_ascii=False) + '\n')
+        result.seconds = time.perf_counter() - t0
+        if progress:
+            progress(result)
+
+    try:
+        chunks = chunked(open_reader(path, fmt), chunk_size)
+        if workers == 0:
+            for chunk in chunks:
+                result.read += len(chunk)
+                consume(*validate_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    result.read += len(chunk)
+                    pending.append(pool.submit(validate_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        consume(*pending.popleft().result())
+                while pending:
+                    consume(*pending.popleft().result())
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if reject_fp:
+            reject_fp.close()
+    writer.commit(version, source='import')
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+# =====================================
+# 내보내기
+# =====================================
+_CSV_KEYS = [key for key, _ in FIELDS] + ["동의어"] + [key for key, _ in DERIVED]
+
+
+def _write_jsonl(fp, records):
+    for rec in records:
+        fp.write(json.dumps(rec, ensure_ascii=False) + '\n')
+        yield
+
+
+def _write_csv(fp, records):
+    writer = csv.writer(fp)
+    writer.writerow(_CSV_KEYS)
+    for rec in records:
+        row = dict(rec, 동의어=SYNONYM_SEP.join(rec["동의어"]))
+        if row["조성"] is not None:
+            row["조성"] = json.dumps(row["조성"], ensure_ascii=False)
+        writer.writerow(["" if row[k] is None else row[k] for k in _CSV_KEYS])
+        yield
+
+
+def _write_sdf(fp, records):
+    # 구조 정보가 없으므로 원자 0개짜리 몰파일 블록 + 데이터 항목
+    for rec in records:
+        fp.write(f"{rec['이름']}\n\n\n  0  0  0  0  0  0  0  0  0  0999 V2000\nM  END\n")
+        for key in _CSV_KEYS:
+            value = rec[key]
+            if key == "동의어":
+                value = '\n'.join(value)
+            elif key == "조성" and value is not None:
+                value = json.dumps(value, ensure_ascii=False)
+            if value not in (None, '', []):
+                fp.write(f"> <{key}>\n{value}\n\n")
+        fp.write("$$$$\n")
+        yield
+
+
+WRITERS = {".jsonl": _write_jsonl, ".json": _write_jsonl, ".ndjson": _write_jsonl,
+           ".csv": _write_csv, ".sdf": _write_sdf, ".sd": _write_sdf}
+
+
+def export_file(store: CompoundStore, path: str, fmt: str = None, progress=None,
+                every: int = 10000) -> int:
+    # 저장소를 pos 순서로 키셋 순회하며 바로 쓴다 — 임시 파일에 쓴 뒤 교체
+    ext = "." + fmt if fmt else os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"지원하지 않는 형식입니다: {ext} ({', '.join(WRITERS)})")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    n = 0
+    try:
+        with open(tmp, 'w', encoding='utf-8', newline='') as fp:
+            for _ in WRITERS[ext](fp, store.iter_full_records()):
+                n += 1
+                if progress and n % every == 0:
+                    progress(n)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    if progress:
+        progress(n)
+    return n
+
+
+# =====================================
+# 명령줄
+# =====================================
+def _print_progress(result):
+    rate = result.read / result.seconds if result.seconds else 0.0
+    print(f"\r읽음 {result.read:,}  저장 {result.written:,}  거부 {result.rejected:,}  "
+          f"({rate:,.0f}건/초)", end='', file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="화합물 데이터 가져오기 / 내보내기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="CSV / JSONL / SDF 파일을 저장소로")
+    imp.add_argument("path")
+    imp.add_argument("--db", default=DEFAULT_DB)
+    imp.add_argument("--format", help="확장자 대신 쓸 형식 (csv, jsonl, sdf)")
+    imp.add_argument("--append", action="store_true", help="기존 DB에 이어 쓰기 (기본은 새로 만듦)")
+    imp.add_argument("--workers", type=int, help="검증 프로세스 수 (기본 CPU 수, 0이면 현재 프로세스)")
+    imp.add_argument("--chunk", type=int, default=5000, help="묶음 크기 (기본 5000)")
+    imp.add_argument("--rejects", help="거부된 줄을 JSONL로 기록할 경로")
+    exp = sub.add_parser("export", help="저장소를 CSV / JSONL / SDF 파일로")
+    exp.add_argument("path")
+    exp.add_argument("--db", default=DEFAULT_DB)
+    exp.add_argument("--format", help="확장자 대신 쓸 형식 (csv, jsonl, sdf)")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        result = import_file(args.path, args.db, args.format, args.append, args.workers,
+                             args.chunk, _print_progress, args.rejects)
+        print(file=sys.stderr)
+        for lineno, formula, msg in result.samples:
+            print(f"  {lineno}행 {formula!r}: {msg}", file=sys.stderr)
+        print(result)
+        return 1 if result.rejected and not result.written else 0
+    store = CompoundStore(args.db)
+    try:
+        n = export_file(store, args.path, args.format,
+                        lambda n: print(f"\r내보냄 {n:,}", end='', file=sys.stderr, flush=True))
+    finally:
+        store.close()
+    print(file=sys.stderr)
+    print(f"{n}건 → {args.path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
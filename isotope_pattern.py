@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# 동위원소 분포: 원소마다 동위원소 다항식(공칭 질량 칸 → 존재비)을 개수만큼 거듭제곱해 모두 곱한다
+# 칸마다 존재비와 함께 '존재비 × 정확한 질량'도 전개해 두면 칸의 평균 정확 질량이 나온다
+# 곱할 때마다 가장 큰 봉우리 대비 threshold 미만인 칸을 잘라 배열을 짧게 유지하고, 긴 배열끼리는 FFT로 곱한다
+from functools import lru_cache
+
+import numpy as np
+
+from elements import MASSES, SYMBOL_INDEX, isotope_info
+from formula_engine import get_composition
+from isotopes import ELECTRON_MASS, element_isotopes, most_abundant
+
+FFT_MIN = 48  # 두 배열이 모두 이보다 길면 FFT 곱셈
+# 계산량·결과 크기 상한 — 원자 10만 개, threshold 1e-12에서 봉우리 약 1만 개 (수십 ms)
+MAX_ATOMS = 100_000
+MIN_THRESHOLD = 1e-12
+
+
+# =====================================
+# 결과 객체
+# =====================================
+class IsotopePattern:
+    # masses: 봉우리 질량 (오름차순, 전하가 있으면 전자 질량을 뺀 이온 질량)
+    # abundances: 합이 1인 존재비
+    __slots__ = ('key', 'charge', 'masses', 'abundances', 'monoisotopic')
+
+    def __init__(self, key, charge, masses, abundances, monoisotopic):
+        self.key = key
+        self.charge = charge
+        self.masses = masses
+        self.abundances = abundances
+        self.monoisotopic = monoisotopic
+
+    def __len__(self):
+        return len(self.masses)
+
+    @property
+    def relative(self):
+        # 가장 큰 봉우리를 100으로 둔 상대 세기
+        return self.abundances * (100.0 / self.abundances.max())
+
+    @property
+    def mz(self):
+        # 질량 대 전하비 (중성 분자면 질량 그대로)
+        return self.masses / abs(self.charge) if self.charge else self.masses
+
+    @property
+    def most_abundant(self) -> float:
+        return float(self.masses[np.argmax(self.abundances)])
+
+    @property
+    def average(self) -> float:
+        return float(self.masses @ self.abundances)
+
+    def peaks(self, min_relative: float = 0.0) -> list:
+        # [(질량 또는 m/z, 상대 세기)]
+        rel = self.relative
+        keep = rel >= min_relative
+        return list(zip(self.mz[keep].tolist(), rel[keep].tolist()))
+
+
+# =====================================
+# 다항식 전개 — 분포 = (첫 칸의 공칭 질량, 존재비 배열, 존재비×질량 배열)
+# =====================================
+def _convolve(a, b):
+    if min(len(a), len(b)) < FFT_MIN:
+        return np.convolve(a, b)
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+    return np.maximum(out, 0.0)  # FFT 반올림 오차로 생기는 작은 음수 제거
+
+
+def _prune(offset, p, w, threshold):
+    keep = p > p.max() * threshold
+    idx = np.flatnonzero(keep)
+    lo, hi = idx[0], idx[-1] + 1
+    p = np.where(keep[lo:hi], p[lo:hi], 0.0)
+    w = np.where(keep[lo:hi], w[lo:hi], 0.0)
+    return offset + int(lo), p, w
+
+
+def _multiply(x, y, threshold):
+    (ox, px, wx), (oy, py, wy) = x, y
+    # (p, w)의 곱: p = px*py, w = wx*py + px*wy (곱의 미분과 같은 규칙)
+    return _prune(ox + oy, _convolve(px, py), _convolve(wx, py) + _convolve(px, wy), threshold)
+
+
+def _power(dist, n, threshold):
+    # 제곱을 거듭하는 거듭제곱 — 곱셈 횟수 O(log n)
+    result = None
+    while n:
+        if n & 1:
+            result = dist if result is None else _multiply(result, dist, threshold)
+        n >>= 1
+        if n:
+            dist = _multiply(dist, dist, threshold)
+    return result
+
+
+def _single(mass):
+    return round(mass), np.ones(1), np.array([mass])
+
+
+@lru_cache(maxsize=None)
+def _element_dist(el: str):
+    # 자연 동위원소 분포, 표지 동위원소('13C')나 안정 동위원소가 없는 원소는 봉우리 하나
+    isotopes = element_isotopes(el)
+    if isotopes is None:
+        z = SYMBOL_INDEX.get(el)
+        if z is not None:
+            return _single(MASSES[z])
+        iso = isotope_info(el)
+        if iso is None:
+            raise ValueError(f"알 수 없는 원소: {el}")
+        return _single(iso[1])
+    offset = isotopes[0][0]
+    p = np.zeros(isotopes[-1][0] - offset + 1)
+    w = np.zeros_like(p)
+    for a, mass, abundance in isotopes:
+        p[a - offset] = abundance
+        w[a - offset] = abundance * mass
+    return offset, p, w
+
+
+def _mono(comp) -> float:
+    total = 0.0
+    for el, count in comp.counts:
+        iso = most_abundant(el)
+        if iso is not None:
+            total += iso[1] * count
+        else:
+            z = SYMBOL_INDEX.get(el)
+            total += (MASSES[z] if z is not None else isotope_info(el)[1]) * count
+    return total - comp.charge * ELECTRON_MASS
+
+
+def _check(comp):
+    if comp.unknown:
+        raise ValueError("알 수 없는 원소: " + ", ".join(comp.unknown))
+    if not comp.counts:
+        raise ValueError("원소가 없습니다.")
+    if sum(n for _, n in comp.counts) > MAX_ATOMS:
+        raise ValueError(f"원자가 너무 많습니다 (최대 {MAX_ATOMS:,}개)")
+
+
+# =====================================
+# 공개 API — 조성 키가 같으면 (표기가 달라도) 캐시를 공유한다
+# =====================================
+@lru_cache(maxsize=256)
+def _pattern(comp, threshold: float) -> IsotopePattern:
+    _check(comp)
+    dist = None
+    for el, count in comp.counts:
+        term = _power(_element_dist(el), count, threshold)
+        dist = term if dist is None else _multiply(dist, term, threshold)
+    offset, p, w = dist
+    nz = np.flatnonzero(p)
+    p, w = p[nz], w[nz]
+    masses = w / p - comp.charge * ELECTRON_MASS
+    abundances = p / p.sum()
+    for arr in (masses, abundances):
+        arr.flags.writeable = False  # 캐시에서 공유되는 배열
+    return IsotopePattern(comp.key, comp.charge, masses, abundances, _mono(comp))
+
+
+def isotope_pattern(formula: str, threshold: float = 1e-6) -> IsotopePattern:
+    # threshold: 가장 큰 봉우리 대비 이보다 작은 봉우리는 버린다 (MIN_THRESHOLD보다 작으면 MIN_THRESHOLD)
+    return _pattern(get_composition(formula), max(threshold, MIN_THRESHOLD))
+
+
+def monoisotopic_mass(formula: str) -> float:
+    # 원소마다 가장 흔한 동위원소의 정확한 질량으로 더한 질량 (전하가 있으면 전자 질량 보정)
+    comp = get_composition(formula)
+    _check(comp)
+    return _mono(comp)
+
+
+def cache_info():
+    return _pattern.cache_info()
@@ -0,0 +1,30 @@
+# streamlit run main.py
+# -*- coding: utf-8 -*-
+import streamlit as st
+
+import metrics
+from admin_panel import admin_sidebar, count_rerun
+from render import CSS
+
+# =====================================
+# 기본 설정 & CSS
+# =====================================
+st.set_page_config(page_title="화합물 정보 사전", page_icon="🧪", layout="wide")
+
+reruns = count_rerun()
+with metrics.span("css"):
+    st.markdown(CSS, unsafe_allow_html=True)
+
+st.markdown('<div class="main-title">🧪🔬 화합물 정보 사전</div>', unsafe_allow_html=True)
+
+# =====================================
+# 페이지 (선택된 페이지 파일만 실행되므로 무거운 모듈은 해당 페이지에서만 불러온다)
+# =====================================
+page = st.navigation([
+    st.Page("app_pages/search.py", title="검색", icon="🔎", default=True),
+    st.Page("app_pages/compound_list.py", title="화합물 목록", icon="📖"),
+    st.Page("app_pages/calculator.py", title="계산 도구", icon="⚗️"),
+])
+page.run()
+
+admin_sidebar(reruns)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# 계측: 단계별 타이밍 구간, 카운터, 캐시 적중률 — Prometheus 텍스트 / JSON으로 내보내기
+# 꺼져 있으면 span()은 공용 no-op 객체를 돌려줄 뿐이라 비용이 거의 없다
+import os
+import threading
+import time
+from collections import OrderedDict
+
+ENABLED = os.environ.get("CHEM_METRICS", "") not in ("", "0")
+
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, float("inf"))
+
+_lock = threading.Lock()
+_timings = {}   # 이름 → [횟수, 합계(초), 최댓값(초), 버킷별 횟수]
+_counters = {}  # 이름 → 값
+_caches = {}    # 이름 → () -> {"hits": .., "misses": ..}
+_sessions = OrderedDict()  # UI 세션 id → 재실행 횟수 (최근에 움직인 MAX_SESSIONS개만)
+MAX_SESSIONS = 256
+
+
+def enable(on: bool = True):
+    global ENABLED
+    ENABLED = on
+
+
+def reset():
+    with _lock:
+        _timings.clear()
+        _counters.clear()
+        _sessions.clear()
+
+
+# =====================================
+# 기록
+# =====================================
+def observe(name: str, seconds: float):
+    with _lock:
+        t = _timings.get(name)
+        if t is None:
+            t = _timings[name] = [0, 0.0, 0.0, [0] * len(BUCKETS)]
+        t[0] += 1
+        t[1] += seconds
+        if seconds > t[2]:
+            t[2] = seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                t[3][i] += 1
+                break
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+def span(name: str):
+    # with span("lookup"): ...
+    return _Span(name) if ENABLED else _NULL
+
+
+def incr(name: str, n: int = 1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def session_rerun(session_id: str) -> int:
+    # 세션별 재실행 횟수를 올리고 돌려준다 — 오래 조용한 세션부터 잊는다
+    if not ENABLED:
+        return 0
+    with _lock:
+        n = _sessions.pop(session_id, 0) + 1
+        _sessions[session_id] = n
+        while len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+    return n
+
+
+def register_cache(name: str, stats):
+    # stats: 호출하면 hits/misses를 담은 dict 또는 functools 캐시의 cache_info()를 돌려주는 함수
+    _caches[name] = stats
+
+
+def _cache_stats():
+    out = {}
+    for name, fn in list(_caches.items()):
+        info = fn()
+        if not isinstance(info, dict):
+            info = {"hits": info.hits, "misses": info.misses}
+        total = info["hits"] + info["misses"]
+        out[name] = {"hits": info["hits"], "misses": info["misses"],
+                     "ratio": info["hits"] / total if total else 0.0}
+    return out
+
+
+# =====================================
+# 내보내기
+# =====================================
+def snapshot() -> dict:
+    with _lock:
+        timings = {name: {"count": t[0], "total_s": t[1], "max_s": t[2],
+                          "mean_ms": t[1] / t[0] * 1e3 if t[0] else 0.0}
+                   for name, t in _timings.items()}
+        counters = dict(_counters)
+        sessions = dict(_sessions)
+    return {"enabled": ENABLED, "timings": timings, "counters": counters, "caches": _cache_stats(),
+            "sessions": sessions}
+
+
+def _label(name: str) -> str:
+    return name.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text() -> str:
+    lines = ["# TYPE chem_stage_seconds histogram"]
+    with _lock:
+        timings = {name: (t[0], t[1], list(t[3])) for name, t in _timings.items()}
+        counters = dict(_counters)
+        sessions = dict(_sessions)
+    for name, (count, total, buckets) in sorted(timings.items()):
+        acc = 0
+        for bound, n in zip(BUCKETS, buckets):
+            acc += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'chem_stage_seconds_bucket{{stage="{_label(name)}",le="{le}"}} {acc}')
+        lines.append(f'chem_stage_seconds_sum{{stage="{_label(name)}"}} {total}')
+        lines.append(f'chem_stage_seconds_count{{stage="{_label(name)}"}} {count}')
+    lines.append("# TYPE chem_events_total counter")
+    for name, value in sorted(counters.items()):
+        lines.append(f'chem_events_total{{event="{_label(name)}"}} {value}')
+    lines.append("# TYPE chem_session_reruns gauge")
+    for sid, value in sessions.items():
+        lines.append(f'chem_session_reruns{{session="{_label(sid)}"}} {value}')
+    lines.append("# TYPE chem_cache_hit_ratio gauge")
+    for name, info in sorted(_cache_stats().items()):
+        lines.append(f'chem_cache_hit_ratio{{cache="{_label(name)}"}} {info["ratio"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# 이름 검색 색인: 한글을 자모로 분해해 접두사 검색 + 자모 트라이그램 유사도 검색
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+# =====================================
+# 한글 자모 분해
+# =====================================
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+         "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+
+def _build_table():
+    # 음절 → 자모 문자열, 공백·괄호·구두점은 제거 (str.translate 한 번으로 정규화)
+    table = {}
+    for code in range(0xAC00, 0xD7A4):
+        off = code - 0xAC00
+        table[code] = _CHO[off // 588] + _JUNG[(off % 588) // 28] + _JONG[off % 28]
+    for c in " \t\n()[]{}·.,-_/'\"":
+        table[ord(c)] = None
+    return table
+
+
+_TABLE = _build_table()
+
+
+def to_jamo(text: str) -> str:
+    # '염화 나트륨' → 'ㅇㅕㅁㅎㅘㄴㅏㅌㅡㄹㅠㅁ' (띄어쓰기·대소문자 차이 무시)
+    return text.lower().translate(_TABLE)
+
+
+def _trigrams(key: str):
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# =====================================
+# 색인
+# =====================================
+class NameIndex:
+    # names: 표시 이름, formulas: 대응 화학식, keys: 자모 키 (항목 번호로 정렬된 병렬 리스트)
+    # 접두사 검색: 항목 번호를 (키 길이, 키) 순으로 정렬해 두면 길이마다 접두사가 같은 키가 한 구간에 모인다
+    # 짧은 길이부터 구간마다 이분 탐색해 limit개를 채우므로 접두사 범위가 아무리 넓어도 짧은 이름이 먼저 나온다
+    # 트라이그램 게시 목록이 너무 긴 흔한 조각은 후보 생성에서 건너뛴다
+    STOP_POSTINGS = 2000
+
+    def __init__(self, entries):
+        names, formulas, keys = [], [], []
+        seen = set()
+        for name, formula in entries:
+            key = to_jamo(name)
+            if not key or (key, formula) in seen:
+                continue
+            seen.add((key, formula))
+            names.append(name)
+            formulas.append(formula)
+            keys.append(key)
+        self.names, self.formulas, self.keys = names, formulas, keys
+
+        order = sorted(range(len(keys)), key=lambda i: (len(keys[i]), keys[i]))
+        self._len_ids = array('i', order)
+        # _len_starts[L]: 길이 L인 키가 _len_ids에서 시작하는 위치 (길이 L+1의 시작이 끝)
+        max_len = len(keys[order[-1]]) if order else 0
+        starts = array('i', [0] * (max_len + 2))
+        for key in keys:
+            starts[len(key) + 1] += 1
+        for L in range(1, len(starts)):
+            starts[L] += starts[L - 1]
+        self._len_starts = starts
+
+        postings = {}
+        sizes = array('i')
+        for i, key in enumerate(keys):
+            grams = _trigrams(key)
+            sizes.append(len(grams))
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        self._postings = {g: array('i', ids) for g, ids in postings.items()}
+        self._ngram_sizes = sizes
+
+    @classmethod
+    def from_store(cls, store):
+        return cls(store.iter_names())
+
+    @classmethod
+    def from_parts(cls, names, formulas, keys, len_ids, len_starts, postings, ngram_sizes):
+        # 이미 만들어 둔 배열로 바로 조립 (스냅숏의 메모리 매핑 뷰 등) — 시퀀스·매핑이면 된다
+        self = cls.__new__(cls)
+        self.names, self.formulas, self.keys = names, formulas, keys
+        self._len_ids, self._len_starts = len_ids, len_starts
+        self._postings, self._ngram_sizes = postings, ngram_sizes
+        return self
+
+    def __len__(self):
+        return len(self.keys)
+
+    def prefix(self, query: str, limit: int = 10) -> list:
+        # 자모 키가 query로 시작하는 항목 번호 — 짧은 이름 우선
+        key = to_jamo(query)
+        if not key:
+            return []
+        keys, ids, starts = self.keys, self._len_ids, self._len_starts
+        out = []
+        for L in range(len(key), len(starts) - 1):
+            lo, hi = starts[L], starts[L + 1]
+            if lo == hi:
+                continue
+            i = bisect_left(ids, key, lo, hi, key=keys.__getitem__)
+            while i < hi and len(out) < limit and keys[ids[i]].startswith(key):
+                out.append(ids[i])
+                i += 1
+            if len(out) >= limit:
+                break
+        return out
+
+    def fuzzy(self, query: str, limit: int = 10, threshold: float = 0.3) -> list:
+        # (항목 번호, Dice 유사도) — 트라이그램이 겹치는 항목만 후보로 본다
+        key = to_jamo(query)
+        if not key:
+            return []
+        grams = _trigrams(key)
+        lists = [p for p in map(self._postings.get, grams) if p is not None]
+        rare = [p for p in lists if len(p) <= self.STOP_POSTINGS]
+        if not rare:  # 모든 조각이 흔하면 후보가 색인 전체에 가까워진다 — 유사 검색을 하지 않는다
+            return []
+        hits = Counter(chain.from_iterable(rare))
+        n = len(grams)
+        sizes = self._ngram_sizes
+        scored = []
+        for i, shared in hits.items():
+            score = 2.0 * shared / (n + sizes[i])
+            if score >= threshold:
+                scored.append((score, i))
+        scored.sort(key=lambda t: (-t[0], len(self.keys[t[1]])))
+        return [(i, s) for s, i in scored[:limit]]
+
+    def search(self, query: str, limit: int = 10) -> list:
+        # 정확 일치(3점) → 접두사(2점) → 유사 일치(0~1점) 순위, 화학식 단위로 중복 제거
+        key = to_jamo(query)
+        if not key:
+            return []
+        results = {}
+
+        def add(i, score):
+            f = self.formulas[i]
+            if f not in results or results[f][2] < score:
+                results[f] = (self.names[i], f, score)
+
+        # 이름과 동의어가 같은 화학식을 가리키는 일이 많으므로 화학식이 limit개 모일 때까지 후보를 늘린다
+        n = limit
+        while True:
+            ids = self.prefix(query, n)
+            for i in ids:
+                add(i, 3.0 if self.keys[i] == key else 2.0)
+            if len(results) >= limit or len(ids) < n:
+                break
+            n *= 4
+        if len(results) < limit:
+            for i, s in self.fuzzy(query, limit):
+                add(i, s)
+        return sorted(results.values(), key=lambda r: -r[2])[:limit]
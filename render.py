@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# 렌더링 계층: CSS·카드·목록 HTML 조각을 데이터 버전별로 한 번만 만들어 재사용
+import html
+from functools import lru_cache
+
+from elements import element_info
+
+# =====================================
+# CSS (모든 페이지 공통)
+# =====================================
+CSS = """
+    <style>
+        body { 
+            background: linear-gradient(to bottom, #e0f7ff 0%, #ffffff 100%);
+            font-family: 'Arial', sans-serif;
+        }
+        .main-title {
+            font-size: 42px; font-weight: bold; text-align: center; color: #1a237e; margin-bottom: 20px;
+            text-shadow: 1px 1px 2px #90caf9;
+        }
+        .sub-title {
+            font-size: 22px; font-weight: bold; color: #1565c0; margin-top: 20px; text-shadow: 1px 1px 1px #bbdefb;
+        }
+        .compound-box {
+            background: rgba(255, 255, 255, 0.7);
+            border-radius: 14px;
+            padding: 12px;
+            margin: 6px 0;
+            border: 2px solid #90caf9;
+            font-size: 16px;
+            color: #0d47a1;
+            text-align: center;
+            font-weight: 500;
+            box-shadow: 2px 2px 8px rgba(0,0,0,0.2);
+            transition: 0.3s;
+        }
+        .compound-box:hover {
+            background: rgba(144, 202, 249, 0.3);
+            cursor: pointer;
+        }
+        .info-card {
+            background: rgba(255,255,255,0.85);
+            border: 2px solid #64b5f6;
+            border-radius: 20px;
+            padding: 20px;
+            margin-top: 15px;
+            box-shadow: 3px 3px 12px rgba(0,0,0,0.15);
+            color: #0d1b2a;
+        }
+        .info-row {
+            display: grid;
+            grid-template-columns: 140px 1fr;
+            padding: 6px 0;
+            border-bottom: 1px solid #cfd8dc;
+            align-items: center;
+        }
+        .info-label {
+            font-weight: 600;
+            color: #1e88e5;
+            font-size: 16px;
+        }
+        .info-value {
+            color: #0d1b2a;
+            font-size: 15px;
+        }
+        .info-card .info-row:last-child {
+            border-bottom: none;
+        }
+        input[type="text"] {
+            border-radius: 12px;
+            border: 2px solid #64b5f6;
+            padding: 8px;
+            width: 100%;
+            font-size: 16px;
+            margin-bottom: 15px;
+        }
+    </style>
+"""
+
+INFO_ROWS = (("🧪 이름", "이름"), ("🌡️ 상태(상온)", "상태(상온)"), ("📂 종류", "종류"),
+             ("📝 설명", "설명"), ("⚛️ 물리적 성질", "물리적 성질"), ("⚠ 안전", "안전"))
+
+
+def _esc(value) -> str:
+    return html.escape('' if value is None else str(value))
+
+
+def compound_box_html(info: dict) -> str:
+    return f'<div class="compound-box">{_esc(info["이름"])} ({_esc(info["화학식"])})</div>'
+
+
+def info_card_html(info: dict) -> str:
+    rows = []
+    for label, key in INFO_ROWS:
+        value = _esc(info.get(key))
+        if key == "이름":
+            value += f" ({_esc(info['화학식'])})"
+        rows.append(f'<div class="info-row"><div class="info-label">{label}</div>'
+                    f'<div class="info-value">{value}</div></div>')
+    return '<div class="info-card">' + ''.join(rows) + '</div>'
+
+
+@lru_cache(maxsize=4096)
+def composition_table(comp) -> dict:
+    # Composition은 해시 가능하므로 원소 조성 표도 조성별로 한 번만 만든다
+    names, counts, masses = [], [], []
+    for el, count in comp.counts:
+        data = element_info(el)
+        if data is not None:
+            mass, kr = data
+            names.append(f"{el} ({kr})")
+            masses.append(round(mass * count, 3))
+        else:
+            names.append(f"{el} (데이터 없음)")
+            masses.append(None)
+        counts.append(count)
+    return {"원소": names, "개수": counts, "질량(g/mol)": masses}
+
+
+# =====================================
+# 데이터 버전별 HTML 캐시
+# =====================================
+class HtmlCache:
+    # 저장소 버전 하나에 묶인 캐시 — 데이터가 바뀌면 새 HtmlCache를 만들어 통째로 무효화
+    def __init__(self, store, per_page: int = 40, maxsize: int = 4096):
+        self.store = store
+        self.version = store.version
+        self.per_page = per_page
+        self.card = lru_cache(maxsize=maxsize)(self._card)
+        self.list_page = lru_cache(maxsize=256)(self._list_page)
+        self._total = len(store)
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self._total // self.per_page))
+
+    def _card(self, formula: str):
+        info = self.store.get(formula)
+        return None if info is None else info_card_html(info)
+
+    def _list_page(self, page: int) -> tuple:
+        # 한 페이지를 (왼쪽 열, 오른쪽 열) HTML 두 덩어리로 — 열마다 st.markdown 한 번
+        page = min(max(page, 1), self.pages)
+        records = self.store.page(self.per_page, (page - 1) * self.per_page)
+        half = len(records) // 2 + len(records) % 2
+        left = ''.join(compound_box_html(r) for r in records[:half])
+        right = ''.join(compound_box_html(r) for r in records[half:])
+        return left, right
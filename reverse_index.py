@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# 역검색 색인: 몰질량 정렬 배열(이분 탐색) + 원소별 비트마스크·게시 목록
+from array import array
+from bisect import bisect_left, bisect_right
+
+from elements import SYMBOL_INDEX
+from formula_engine import get_composition
+
+
+def element_mask(symbols) -> int:
+    # 원소 기호들 → 원자 번호 비트마스크, 모르는 기호는 ValueError
+    mask = 0
+    for sym in symbols:
+        z = SYMBOL_INDEX.get(sym)
+        if z is None:
+            raise ValueError(f"알 수 없는 원소: {sym}")
+        mask |= 1 << z
+    return mask
+
+
+def parse_element_list(text: str) -> list:
+    # 'N, O' / 'N O' → ['N', 'O']
+    return [s for s in text.replace(',', ' ').split() if s]
+
+
+class ReverseIndex:
+    # formulas: 항목 번호 → 화학식, masks: 항목 번호 → 원소 비트마스크
+    # 몰질량은 오름차순 정렬 배열과 그 순서의 항목 번호를 함께 둔다
+    def __init__(self, formulas):
+        self.formulas = []
+        self.masses = array('d')
+        self.masks = []
+        postings = {}
+        for f in formulas:
+            try:
+                comp = get_composition(f)
+            except ValueError:
+                continue
+            if comp.unknown:
+                continue
+            i = len(self.formulas)
+            mask = 0
+            for z, _ in comp.zcounts:
+                mask |= 1 << z
+                postings.setdefault(z, array('i')).append(i)
+            self.formulas.append(f)
+            self.masses.append(comp.mass)
+            self.masks.append(mask)
+        order = sorted(range(len(self.formulas)), key=self.masses.__getitem__)
+        self._sorted_masses = array('d', (self.masses[i] for i in order))
+        self._sorted_ids = array('i', order)
+        self._postings = postings
+
+    @classmethod
+    def from_store(cls, store):
+        return cls(rec["화학식"] for rec in store.iter_records())
+
+    @classmethod
+    def from_parts(cls, formulas, masses, masks, sorted_masses, sorted_ids, postings):
+        self = cls.__new__(cls)
+        self.formulas, self.masses, self.masks = formulas, masses, masks
+        self._sorted_masses, self._sorted_ids = sorted_masses, sorted_ids
+        self._postings = postings
+        return self
+
+    def __len__(self):
+        return len(self.formulas)
+
+    def mass_range(self, lo: float, hi: float) -> array:
+        # lo ≤ 몰질량 ≤ hi 인 항목 번호 (질량 오름차순)
+        a = bisect_left(self._sorted_masses, lo)
+        b = bisect_right(self._sorted_masses, hi)
+        return self._sorted_ids[a:b]
+
+    def query(self, mass: float = None, tol: float = 0.1, include=(), exclude=(),
+              limit: int = 50) -> list:
+        # (화학식, 몰질량) 목록 — 질량 조건이 있으면 질량 차이 순, 없으면 질량 순
+        need = element_mask(include)
+        ban = element_mask(exclude)
+        if mass is not None:
+            candidates = self.mass_range(mass - tol, mass + tol)
+        elif include:
+            # 가장 짧은 게시 목록에서 출발해 나머지는 비트마스크로 거른다
+            zs = [SYMBOL_INDEX[s] for s in include]
+            lists = [self._postings.get(z, ()) for z in zs]
+            candidates = min(lists, key=len)
+        else:
+            candidates = self._sorted_ids
+        # 조건이 원소 제외뿐이면 질량 순으로 limit개만 모으면 된다
+        early = mass is None and not include
+        masks = self.masks
+        hits = []
+        for i in candidates:
+            m = masks[i]
+            if m & need == need and not m & ban:
+                hits.append(i)
+                if early and len(hits) >= limit:
+                    break
+        if mass is not None:
+            hits.sort(key=lambda i: abs(self.masses[i] - mass))
+        else:
+            hits.sort(key=self.masses.__getitem__)
+        return [(self.formulas[i], self.masses[i]) for i in hits[:limit]]
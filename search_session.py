@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# 검색 세션: 사용자 한 명이 입력 중인 검색어의 조회를 관리 (Streamlit 없이 import 가능)
+#   - 세션별 최근 결과 LRU — 지웠다 다시 친 검색어, 미리 가져온 추천어는 바로 돌려준다
+#   - 화면에 쓸 조회는 호출한 스레드에서 바로 한다 (다른 세션의 미리 가져오기 뒤에 줄 서지 않는다)
+#   - 상위 추천 항목은 별도의 작은 풀에서 미리 조회·렌더링해 둔다, 밀린 작업이 많으면 건너뛴다
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+# 모든 세션이 함께 쓰는 미리 가져오기 전용 스레드와 대기 작업 한도
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_MAX_QUEUED = 16
+_queued = 0
+_queued_lock = threading.Lock()
+
+
+class SearchSession:
+    # core 하나(저장소 버전 하나)에 묶인다 — 버전이 바뀌면 새 세션을 만든다
+    def __init__(self, core, warm=None, maxsize: int = 64, prefetch: int = 3):
+        self.core = core
+        self.version = core.version
+        self.warm = warm
+        self.maxsize = maxsize
+        self.prefetch_count = prefetch
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = set()
+
+    def __len__(self):
+        return len(self._lru)
+
+    def _get(self, key):
+        with self._lock:
+            result = self._lru.get(key)
+            if result is not None:
+                self._lru.move_to_end(key)
+            return result
+
+    def _put(self, key, result):
+        with self._lock:
+            self._lru[key] = result
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def search(self, query: str) -> dict:
+        # core.lookup()과 같은 dict
+        key = query.strip()
+        result = self._get(key)
+        if result is not None:
+            metrics.incr("search.session_hit")
+        else:
+            metrics.incr("search.session_miss")
+            result = self.core.lookup(key)
+            self._put(key, result)
+        self._prefetch(result)
+        return result
+
+    def _prefetch(self, result):
+        # 추천 이름 상위 몇 개를 백그라운드에서 조회해 LRU에 넣는다
+        global _queued
+        for name, _, _ in result["suggestions"][:self.prefetch_count]:
+            with self._lock:
+                if name in self._lru or name in self._inflight:
+                    continue
+                with _queued_lock:
+                    if _queued >= _MAX_QUEUED:
+                        metrics.incr("search.prefetch_skipped")
+                        return
+                    _queued += 1
+                self._inflight.add(name)
+            _POOL.submit(self._prefetch_one, name)
+
+    def _prefetch_one(self, key):
+        global _queued
+        try:
+            result = self.core.lookup(key)
+            if self.warm is not None and result["formula"]:
+                try:
+                    self.warm(result["formula"])
+                except ValueError:  # 조성 오류는 화면에서 다시 만나 그대로 표시한다
+                    pass
+            self._put(key, result)
+            metrics.incr("search.prefetch")
+        finally:
+            with _queued_lock:
+                _queued -= 1
+            with self._lock:
+                self._inflight.discard(key)
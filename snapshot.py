@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# 저장소 + 검색 색인 스냅숏 — 미리 만들어 둔 이진 파일을 작업 프로세스들이 읽기 전용으로 메모리 매핑
+#   python snapshot.py publish            data/compounds.db 로 새 스냅숏을 만들어 게시
+#   python snapshot.py info               현재 스냅숏 정보
+# 디렉터리 구성: CURRENT (현재 스냅숏 이름) + <이름>.db (저장소 사본) + <이름>.idx (색인)
+# 게시는 파일을 다 쓴 뒤 CURRENT만 원자적으로 바꾸므로, 작업 프로세스는 재시작 없이 다음 확인 때 갈아탄다
+# 이전 스냅숏을 쓰던 요청은 이미 연 파일(매핑)을 그대로 끝까지 쓴다
+import argparse
+import json
+import logging
+import mmap
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from array import array
+
+from compound_store import DATA_DIR, DEFAULT_DB, CompoundStore
+from name_index import NameIndex
+from reverse_index import ReverseIndex
+
+DEFAULT_DIR = os.path.join(DATA_DIR, 'snapshots')
+MAGIC = b"CHEMSNP2"  # 색인 배치가 바뀌면 올린다 — 이전 형식 스냅숏은 열지 않는다
+_HEAD = struct.Struct("<8sI")  # 매직, 머리말(JSON) 길이
+_log = logging.getLogger(__name__)
+
+
+# =====================================
+# 매핑된 배열 위의 읽기 전용 시퀀스
+# =====================================
+class StrList:
+    # utf-8 바이트 덩어리 + 시작 위치 배열(n+1개) — 꺼낼 때만 str로 디코딩
+    __slots__ = ('_blob', '_off')
+
+    def __init__(self, blob, offsets):
+        self._blob, self._off = blob, offsets
+
+    def __len__(self):
+        return len(self._off) - 1
+
+    def __getitem__(self, i):
+        off = self._off
+        if i < 0:
+            i += len(off) - 1
+        return str(self._blob[off[i]:off[i + 1]], 'utf-8')
+
+
+class PostingMap:
+    # 키 → 평평한 id 배열의 구간, dict처럼 `in`·[]·get으로 쓴다
+    # 키 목록(트라이그램 수만 개)만 열 때 dict로 풀고, 큰 id 배열은 매핑된 채로 둔다
+    __slots__ = ('_index', '_off', '_ids')
+
+    def __init__(self, keys, offsets, ids):
+        self._index = {k: i for i, k in enumerate(keys)}
+        self._off, self._ids = offsets, ids
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getitem__(self, key):
+        i = self._index[key]
+        return self._ids[self._off[i]:self._off[i + 1]]
+
+    def get(self, key, default=None):
+        i = self._index.get(key)
+        return default if i is None else self._ids[self._off[i]:self._off[i + 1]]
+
+
+class WideMasks:
+    # 119비트 원소 마스크를 하위·상위 64비트 두 배열로 나눠 저장
+    __slots__ = ('_lo', '_hi')
+
+    def __init__(self, lo, hi):
+        self._lo, self._hi = lo, hi
+
+    def __len__(self):
+        return len(self._lo)
+
+    def __getitem__(self, i):
+        return self._lo[i] | self._hi[i] << 64
+
+
+# =====================================
+# 쓰기
+# =====================================
+class _Writer:
+    def __init__(self):
+        self.sections = {}
+        self.chunks = []
+        self.size = 0
+
+    def add(self, name, data, typecode='B'):
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        self.sections[name] = (self.size, len(raw), typecode)
+        pad = -len(raw) % 8  # 다음 구간을 8바이트 경계에 맞춘다
+        self.chunks.append(raw + b"\0" * pad)
+        self.size += len(raw) + pad
+
+    def add_strings(self, name, strings):
+        blob = bytearray()
+        offsets = array('q', [0])
+        for s in strings:
+            blob += s.encode('utf-8')
+            offsets.append(len(blob))
+        self.add(name + ".blob", blob)
+        self.add(name + ".off", offsets, 'q')
+
+    def add_postings(self, name, postings: dict):
+        keys = sorted(postings)
+        offsets = array('q', [0])
+        ids = array('i')
+        for k in keys:
+            ids.extend(postings[k])
+            offsets.append(len(ids))
+        self.add(name + ".off", offsets, 'q')
+        self.add(name + ".ids", ids, 'i')
+        return keys
+
+    def write(self, path, meta):
+        head = json.dumps(dict(meta, sections=self.sections), ensure_ascii=False).encode('utf-8')
+        head += b" " * (-(len(head) + _HEAD.size) % 8)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as fp:
+            fp.write(_HEAD.pack(MAGIC, len(head)))
+            fp.write(head)
+            for chunk in self.chunks:
+                fp.write(chunk)
+        os.replace(tmp, path)
+
+
+def write_index(path: str, names: NameIndex, reverse: ReverseIndex, version: str):
+    w = _Writer()
+    w.add_strings("name.names", names.names)
+    w.add_strings("name.formulas", names.formulas)
+    w.add_strings("name.keys", names.keys)
+    w.add("name.len_ids", names._len_ids, 'i')
+    w.add("name.len_starts", names._len_starts, 'i')
+    w.add("name.ngram_sizes", names._ngram_sizes, 'i')
+    grams = w.add_postings("name.postings", names._postings)
+    w.add("name.grams", '\0'.join(grams).encode('utf-8'))
+
+    w.add_strings("rev.formulas", reverse.formulas)
+    w.add("rev.masses", reverse.masses, 'd')
+    w.add("rev.masks_lo", array('Q', (m & 0xFFFFFFFFFFFFFFFF for m in reverse.masks)), 'Q')
+    w.add("rev.masks_hi", array('Q', (m >> 64 for m in reverse.masks)), 'Q')
+    w.add("rev.sorted_masses", reverse._sorted_masses, 'd')
+    w.add("rev.sorted_ids", reverse._sorted_ids, 'i')
+    zs = w.add_postings("rev.postings", reverse._postings)
+    w.add("rev.postings.z", array('i', zs), 'i')
+    w.write(path, {"version": version, "entries": len(names), "formulas": len(reverse)})
+
+
+# =====================================
+# 읽기
+# =====================================
+class Snapshot:
+    # 저장소 사본 + 매핑된 색인 한 벌 — 열 때 색인을 다시 만들지 않는다
+    def __init__(self, directory: str, name: str):
+        self.name = name
+        self.store = CompoundStore(os.path.join(directory, name + ".db"))
+        try:
+            self._open_index(os.path.join(directory, name + ".idx"))
+        except Exception:
+            self.store.close()
+            raise
+
+    def _open_index(self, path):
+        with open(path, 'rb') as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, head_len = _HEAD.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"스냅숏 파일이 아닙니다: {path}")
+        self.meta = json.loads(bytes(self._map[_HEAD.size:_HEAD.size + head_len]))
+        self.version = self.meta["version"]
+        view = memoryview(self._map)
+        base = _HEAD.size + head_len
+        sec = {k: view[base + off:base + off + size].cast(tc)
+               for k, (off, size, tc) in self.meta["sections"].items()}
+
+        def strings(name):
+            return StrList(sec[name + ".blob"], sec[name + ".off"])
+
+        self.name_index = NameIndex.from_parts(
+            strings("name.names"), strings("name.formulas"), strings("name.keys"),
+            sec["name.len_ids"], sec["name.len_starts"],
+            PostingMap(str(sec["name.grams"], 'utf-8').split('\0'),
+                       sec["name.postings.off"], sec["name.postings.ids"]),
+            sec["name.ngram_sizes"])
+        off, ids = sec["rev.postings.off"], sec["rev.postings.ids"]
+        self.reverse_index = ReverseIndex.from_parts(
+            strings("rev.formulas"), sec["rev.masses"],
+            WideMasks(sec["rev.masks_lo"], sec["rev.masks_hi"]),
+            sec["rev.sorted_masses"], sec["rev.sorted_ids"],
+            {z: ids[off[i]:off[i + 1]] for i, z in enumerate(sec["rev.postings.z"])})
+
+
+def current_name(directory: str = DEFAULT_DIR):
+    try:
+        with open(os.path.join(directory, "CURRENT"), encoding='utf-8') as fp:
+            return fp.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class SnapshotWatcher:
+    # current(): 게시된 스냅숏 (없으면 None), CURRENT 파일은 interval초에 한 번만 확인
+    def __init__(self, directory: str = DEFAULT_DIR, interval: float = 1.0):
+        self.directory = directory
+        self.interval = interval
+        self._snapshot = None
+        self._checked = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self):
+        now = time.monotonic()
+        if now - self._checked < self.interval:
+            return self._snapshot
+        with self._lock:
+            if now - self._checked >= self.interval:
+                self._checked = now
+                name = current_name(self.directory)
+                if name is None:
+                    self._snapshot = None
+                elif self._snapshot is None or self._snapshot.name != name:
+                    try:
+                        self._snapshot = Snapshot(self.directory, name)
+                    except (OSError, ValueError, KeyError, struct.error, sqlite3.Error):
+                        # 빠졌거나 덜 쓴 파일 — 쓰던 스냅숏을 계속 쓰고 다음 확인 때 다시 연다
+                        _log.exception("스냅숏 %s 를 열 수 없습니다", name)
+        return self._snapshot
+
+
+# =====================================
+# 게시
+# =====================================
+def publish(db_path: str = DEFAULT_DB, directory: str = DEFAULT_DIR, keep: int = 2) -> str:
+    # 저장소 사본과 색인을 새 이름으로 쓴 뒤 CURRENT를 교체, 오래된 스냅숏은 keep개만 남긴다
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}"
+    db_copy = os.path.join(directory, name + ".db")
+    shutil.copyfile(db_path, db_copy + ".tmp")
+    os.replace(db_copy + ".tmp", db_copy)
+    store = CompoundStore(db_copy)
+    try:
+        write_index(os.path.join(directory, name + ".idx"), NameIndex.from_store(store),
+                    ReverseIndex.from_store(store), store.version)
+    finally:
+        store.close()
+    pointer = os.path.join(directory, "CURRENT")
+    with open(pointer + ".tmp", 'w', encoding='utf-8') as fp:
+        fp.write(name)
+    os.replace(pointer + ".tmp", pointer)
+    _prune(directory, keep)
+    return name
+
+
+def _prune(directory: str, keep: int):
+    names = sorted((f[:-4] for f in os.listdir(directory) if f.endswith(".idx")),
+                   key=lambda n: os.path.getmtime(os.path.join(directory, n + ".idx")))
+    for name in names[:-keep]:
+        for ext in (".idx", ".db"):
+            try:
+                os.remove(os.path.join(directory, name + ext))
+            except OSError:  # 아직 매핑 중인 파일(Windows)은 다음 게시 때 지운다
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장소·색인 스냅숏")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pub = sub.add_parser("publish", help="새 스냅숏을 만들어 게시")
+    pub.add_argument("--db", default=DEFAULT_DB)
+    pub.add_argument("--dir", default=DEFAULT_DIR)
+    pub.add_argument("--keep", type=int, default=2, help="남겨 둘 스냅숏 수 (기본 2)")
+    info = sub.add_parser("info", help="현재 스냅숏 정보")
+    info.add_argument("--dir", default=DEFAULT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        t = time.perf_counter()
+        name = publish(args.db, args.dir, args.keep)
+        print(f"{name} 게시 ({time.perf_counter() - t:.2f}초)")
+        return 0
+    name = current_name(args.dir)
+    if name is None:
+        print("게시된 스냅숏이 없습니다.", file=sys.stderr)
+        return 1
+    snap = Snapshot(args.dir, name)
+    print(json.dumps(dict(name=name, **{k: v for k, v in snap.meta.items() if k != "sections"}),
+                     ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+# 용액 계산: 단위가 붙은 수량 해석, 질량 ↔ 몰, 몰농도, 희석, 조성 백분율, 여러 용액 준비표
+# 변환 함수는 산술만 쓰므로 float에도 NumPy 배열에도 그대로 쓸 수 있다 (준비표는 열 단위로 한 번에 계산)
+# NumPy는 준비표를 만들 때만 불러온다 — 검색 화면의 간단한 계산은 NumPy 없이 동작
+import csv
+import io
+import re
+
+from elements import element_info
+from formula_engine import get_composition
+
+# =====================================
+# 단위
+# =====================================
+# 기호 → (종류, 기준 단위 배율) — 기준 단위: g, mol, L, mol/L
+UNITS = {
+    "kg": ("mass", 1e3), "g": ("mass", 1.0), "mg": ("mass", 1e-3),
+    "µg": ("mass", 1e-6), "ug": ("mass", 1e-6),
+    "mol": ("amount", 1.0), "mmol": ("amount", 1e-3),
+    "µmol": ("amount", 1e-6), "umol": ("amount", 1e-6), "nmol": ("amount", 1e-9),
+    "L": ("volume", 1.0), "l": ("volume", 1.0), "mL": ("volume", 1e-3), "ml": ("volume", 1e-3),
+    "µL": ("volume", 1e-6), "uL": ("volume", 1e-6), "ul": ("volume", 1e-6),
+    "M": ("molarity", 1.0), "mol/L": ("molarity", 1.0), "mM": ("molarity", 1e-3),
+    "mmol/L": ("molarity", 1e-3), "µM": ("molarity", 1e-6), "uM": ("molarity", 1e-6),
+    "nM": ("molarity", 1e-9),
+}
+KIND_NAMES = {"mass": "질량", "amount": "물질의 양", "volume": "부피", "molarity": "몰농도"}
+# 출력할 때 고르는 단위 (큰 것부터)
+DISPLAY_UNITS = {"mass": ("kg", "g", "mg", "µg"), "amount": ("mol", "mmol", "µmol", "nmol"),
+                 "volume": ("L", "mL", "µL"), "molarity": ("M", "mM", "µM", "nM")}
+
+_QUANTITY = re.compile(r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*)")
+
+
+def parse_quantity(text, kind: str) -> float:
+    # '250 mL' → 0.25 (기준 단위), 숫자만 있으면 기준 단위로 본다
+    # 단위 종류가 kind와 다르거나, 읽을 수 없거나, 0 이하면 ValueError
+    if isinstance(text, (int, float)):
+        value = float(text)
+    else:
+        m = _QUANTITY.fullmatch(text.strip().replace(',', ''))
+        if not m:
+            raise ValueError(f"수량을 읽을 수 없습니다: {text!r}")
+        unit = m.group(2).replace(' ', '')
+        spec = UNITS.get(unit) if unit else (kind, 1.0)
+        if spec is None:
+            raise ValueError(f"모르는 단위입니다: {unit}")
+        if spec[0] != kind:
+            raise ValueError(f"{KIND_NAMES[kind]} 단위가 아닙니다: {unit}")
+        value = float(m.group(1)) * spec[1]
+    if not value > 0:
+        raise ValueError(f"{KIND_NAMES[kind]}: 0보다 커야 합니다.")
+    return value
+
+
+def format_quantity(value: float, kind: str, digits: int = 4) -> str:
+    # 0.0025 (L) → '2.5 mL'
+    if value != value:
+        return ""
+    units = DISPLAY_UNITS[kind]
+    if value == 0:
+        return "0 " + next(u for u in units if UNITS[u][1] == 1.0)
+    for unit in units:
+        if abs(value) >= UNITS[unit][1]:
+            break
+    return f"{value / UNITS[unit][1]:.{digits}g} {unit}"
+
+
+# =====================================
+# 변환 (인자·결과는 기준 단위, 배열 가능)
+# =====================================
+def molar_mass(formula: str) -> float:
+    # 파서의 LRU 캐시를 그대로 쓴다
+    comp = get_composition(formula)
+    if comp.unknown:
+        raise ValueError("알 수 없는 원소: " + ", ".join(comp.unknown))
+    return comp.mass
+
+
+def moles_from_mass(mass, molar_mass):
+    return mass / molar_mass
+
+
+def mass_from_moles(moles, molar_mass):
+    return moles * molar_mass
+
+
+def solute_mass(molarity, volume, molar_mass):
+    # 몰농도 molarity 용액 volume을 만드는 데 필요한 용질 질량
+    return molarity * volume * molar_mass
+
+
+def molarity_of(mass, volume, molar_mass):
+    return mass / molar_mass / volume
+
+
+def stock_volume(stock, molarity, volume):
+    # 농도 stock인 원액에서 molarity 용액 volume을 만들 때 덜어낼 원액 부피 (C1V1 = C2V2)
+    return molarity * volume / stock
+
+
+def dilution(c1=None, v1=None, c2=None, v2=None) -> float:
+    # C1V1 = C2V2 에서 비어 있는(None) 값 하나를 구한다
+    values = {"c1": c1, "v1": v1, "c2": c2, "v2": v2}
+    missing = [k for k, v in values.items() if v is None]
+    if len(missing) != 1:
+        raise ValueError("C1, V1, C2, V2 중 정확히 하나만 비워 두세요.")
+    if any(v is not None and v <= 0 for v in values.values()):
+        raise ValueError("농도와 부피는 0보다 커야 합니다.")
+    if c1 is None:
+        c1 = answer = c2 * v2 / v1
+    elif v1 is None:
+        v1 = answer = c2 * v2 / c1
+    elif c2 is None:
+        c2 = answer = c1 * v1 / v2
+    else:
+        v2 = answer = c1 * v1 / c2
+    # 어느 값을 구했든 C1 ≥ C2 (V1 ≤ V2)여야 희석이다 — 반올림 오차만큼은 봐준다
+    if c2 > c1 * (1 + 1e-12):
+        raise ValueError("원액보다 진한 용액은 희석으로 만들 수 없습니다.")
+    return answer
+
+
+def percent_composition(formula: str) -> list:
+    # [(원소, 개수, 질량 백분율)] — 질량 기여가 큰 순
+    comp = get_composition(formula)
+    if comp.unknown:
+        raise ValueError("알 수 없는 원소: " + ", ".join(comp.unknown))
+    out = [(el, count, element_info(el)[0] * count / comp.mass * 100) for el, count in comp.counts]
+    return sorted(out, key=lambda t: -t[2])
+
+
+# =====================================
+# 준비표 (여러 용액을 한 번에)
+# =====================================
+def parse_column(values, kind: str, blank_ok: bool = False) -> tuple:
+    # 수량 열 → (기준 단위 배열, [(행 번호, 오류)]) — 오류·빈 칸은 NaN
+    # 숫자 배열은 그대로 쓰고, 문자열은 같은 값끼리 한 번만 해석 (준비표는 '100 mL' 같은 값이 반복된다)
+    import numpy as np
+
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+        out = values.astype(np.float64)
+        bad = out <= 0 if blank_ok else ~(out > 0)
+        out[bad] = np.nan
+        return out, [(int(r), f"{KIND_NAMES[kind]}: 0보다 커야 합니다.") for r in np.flatnonzero(bad)]
+    values = list(values)
+    out = np.full(len(values), np.nan)
+    errors = []
+    seen = {}
+    for r, v in enumerate(values):
+        if v is None or (isinstance(v, str) and not v.strip()):
+            if not blank_ok:
+                errors.append((r, f"{KIND_NAMES[kind]}: 비어 있습니다."))
+            continue
+        q = seen.get(v)
+        if q is None:
+            try:
+                q = parse_quantity(v, kind)
+            except ValueError as e:
+                q = str(e)
+            seen[v] = q
+        if isinstance(q, str):
+            errors.append((r, q))
+        else:
+            out[r] = q
+    return out, errors
+
+
+class PrepSheet:
+    # 열마다 NumPy 배열 (기준 단위), 계산할 수 없는 행은 NaN
+    # stock_volume: 원액 농도를 준 행만 값이 있다
+    # errors: [(행 번호, 오류 메시지)]
+    __slots__ = ('formulas', 'molar_mass', 'molarity', 'volume', 'moles', 'grams', 'stock',
+                 'stock_volume', 'errors')
+
+    def __init__(self, **columns):
+        for name in self.__slots__:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.formulas)
+
+    def table(self) -> dict:
+        # 화면·CSV용 문자열 표
+        errors = {}
+        for r, msg in self.errors:
+            errors.setdefault(r, []).append(msg)
+        return {
+            "화학식": self.formulas,
+            "몰질량(g/mol)": [round(m, 3) if m == m else None for m in self.molar_mass.tolist()],
+            "몰농도": [format_quantity(v, "molarity") for v in self.molarity.tolist()],
+            "부피": [format_quantity(v, "volume") for v in self.volume.tolist()],
+            "필요한 용질": [format_quantity(v, "mass") for v in self.grams.tolist()],
+            "원액 부피": [format_quantity(v, "volume") for v in self.stock_volume.tolist()],
+            "오류": ["; ".join(errors.get(r, ())) for r in range(len(self))],
+        }
+
+    def to_csv(self) -> str:
+        table = self.table()
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(table)
+        writer.writerows(zip(*table.values()))
+        return buf.getvalue()
+
+
+def prep_sheet(formulas, molarities, volumes, stocks=None) -> PrepSheet:
+    # 몰질량은 batch_compose의 행렬-벡터 곱으로, 나머지는 열 단위 배열 연산으로 계산
+    import numpy as np
+
+    from batch import batch_compose
+    formulas = list(formulas)
+    comp = batch_compose(formulas)
+    errors = [(r, msg) for r, _, msg in comp.errors]
+    molarity, e1 = parse_column(molarities, "molarity")
+    volume, e2 = parse_column(volumes, "volume")
+    errors += e1 + e2
+    if stocks is None:
+        stock = np.full(len(formulas), np.nan)
+    else:
+        stock, e3 = parse_column(stocks, "molarity", blank_ok=True)
+        errors += e3
+        weak = np.flatnonzero(stock < molarity)
+        errors += [(int(r), "원액이 목표 농도보다 묽습니다.") for r in weak]
+        stock[weak] = np.nan
+    moles = molarity * volume
+    errors.sort()
+    return PrepSheet(formulas=formulas, molar_mass=comp.masses, molarity=molarity, volume=volume,
+                     moles=moles, grams=mass_from_moles(moles, comp.masses), stock=stock,
+                     stock_volume=stock_volume(stock, molarity, volume), errors=errors)
+
+
+PREP_COLUMNS = ("화학식", "몰농도", "부피", "원액 농도")
+
+
+def prep_sheet_csv(path: str, encoding: str = 'utf-8') -> PrepSheet:
+    # 열: 화학식, 몰농도, 부피 (+ 선택: 원액 농도)
+    with open(path, newline='', encoding=encoding) as fp:
+        reader = csv.DictReader(fp)
+        missing = [c for c in PREP_COLUMNS[:3] if c not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"CSV에 {', '.join(missing)} 열이 없습니다.")
+        rows = list(reader)
+    has_stock = "원액 농도" in reader.fieldnames
+    return prep_sheet([(r["화학식"] or '').strip() for r in rows], [r["몰농도"] for r in rows],
+                      [r["부피"] for r in rows],
+                      [r["원액 농도"] for r in rows] if has_stock else None)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# 페이지 공통: 프로세스당 한 번 만드는 자원과 공통 머리말
+import streamlit as st
+
+import metrics
+from chem_core import get_core
+from render import HtmlCache
+
+
+@st.cache_resource(max_entries=2)
+def _html_cache(version: str, path: str):
+    # 저장소(스냅숏)가 바뀔 때만 다시 만든다 — 지금 것과 직전 것만 남겨
+    # 갈아탄 스냅숏의 저장소 연결을 붙잡아 두지 않는다 (지워진 .db 파일 핸들이 새지 않도록)
+    cache = HtmlCache(get_core().store)
+    metrics.register_cache("html_card", cache.card.cache_info)
+    metrics.register_cache("html_list", cache.list_page.cache_info)
+    return cache
+
+
+def core():
+    # get_core는 프로세스당 하나, 새 스냅숏이 게시되면 다음 재실행부터 갈아탄다
+    return get_core()
+
+
+def html_cache() -> HtmlCache:
+    store = get_core().store
+    return _html_cache(store.version, store.path)
+
+
+def sub_title(text: str):
+    st.markdown(f'<div class="sub-title">{text}</div>', unsafe_allow_html=True)